@@ -0,0 +1,77 @@
+# =============================================================================
+# agents/agent_catalog.py
+# =============================================================================
+# Purpose:
+# Compact catalog of downstream agents rendered into an orchestrator's system
+# instruction, so the model can call_agent() directly instead of spending a
+# tool-call round-trip on list_agents() every time it delegates.
+# - Built from the cached AgentDiscovery registry (healthy agents only)
+# - One line per agent: name, short description and skill names
+# - Re-rendered only when the registry reloads or an agent's health changes
+# =============================================================================
+
+import logging
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from models.agent import AgentCard
+
+logger = logging.getLogger(__name__)
+
+
+class AgentCatalog:
+    """
+    Renders the agents known to `discovery` as prompt text.
+
+    Args:
+        discovery (AgentDiscovery): Registry to read agents from.
+        exclude (iterable[str]): Agent ids or names left out (usually the caller itself).
+        max_description (int): Descriptions are cut to this many characters.
+    """
+
+    def __init__(self, discovery, exclude: Iterable[str] = (), max_description: int = 120):
+        self.discovery = discovery
+        self.exclude = {name.lower() for name in exclude}
+        self.max_description = max_description
+        self.version = 0  # Bumped whenever the rendered text changes
+        self._entries: Optional[Tuple[str, ...]] = None
+        self._text = ""
+
+    def _line(self, card: AgentCard) -> str:
+        line = f"- {card.name}"
+        description = " ".join((card.description or "").split())
+        if len(description) > self.max_description:
+            description = description[:self.max_description - 3].rstrip() + "..."
+        if description:
+            line += f": {description}"
+        skills = [
+            skill.name
+            for capability in (card.capabilities.capabilities if card.capabilities else [])
+            for skill in capability.skills
+        ]
+        if skills:
+            line += f" (skills: {', '.join(skills)})"
+        return line
+
+    async def render(self) -> str:
+        """Catalog text for the currently available agents."""
+        cards: List[AgentCard] = await self.discovery.discover_agents()
+        entries = tuple(
+            self._line(card) for card in cards
+            if (card.id or "").lower() not in self.exclude and card.name.lower() not in self.exclude
+        )
+        if entries != self._entries:
+            self._entries = entries
+            self._text = "\n".join(entries) if entries else "- (no agents are currently available)"
+            self.version += 1
+            logger.info(f"[AgentCatalog] Rendered {len(entries)} agents into the prompt (v{self.version})")
+        return self._text
+
+    def instruction(self, preamble: str) -> Callable[..., Awaitable[str]]:
+        """
+        ADK instruction provider: `preamble` followed by the current catalog.
+        Pass it as LlmAgent(instruction=...); it is evaluated on every model call.
+        """
+        async def provider(_context) -> str:
+            return f"{preamble}\n\nAvailable agents (pass the name to call_agent):\n{await self.render()}"
+
+        return provider
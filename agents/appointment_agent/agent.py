@@ -1,36 +1,59 @@
 import logging
+from typing import AsyncIterator
 from dotenv import load_dotenv
 
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import BaseSessionService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.tools.function_tool import FunctionTool
 from google.genai import types
 
+from models.task import AgentUpdate
 from utilities.a2a.agent_discovery import DiscoveryClient
-from utilities.a2a.agent_connect import AgentConnector
-from llm_config import get_llm_config
+from utilities.a2a.connector_pool import ConnectorPool, get_connector_pool
+from agents.llm_config import get_llm_config
+from agents.agent_catalog import AgentCatalog
+from agents.event_stream import updates_from_event
+from agents.rate_limiter import get_llm_limiter
+from agents.session_service import BoundedSessionService
+from agents.response_cache import ResponseCache, append_cached_turn, cache_key, session_fingerprint, used_tools
 
 logger = logging.getLogger(__name__)
 load_dotenv()
 
+# Partial text arrives as it is generated, so stream() can forward it
+STREAMING = RunConfig(streaming_mode=StreamingMode.SSE)
+
 
 class AppointmentAgent:
-    def __init__(self):
+    def __init__(self, response_cache: ResponseCache = None, prompt_catalog: bool = True,
+                 session_service: BaseSessionService = None):
+        """
+        Args:
+            response_cache (ResponseCache, optional): Reuse replies to repeated questions.
+            prompt_catalog (bool): Render the agent catalog into the instruction so
+                delegating takes one call_agent() instead of list_agents() + call_agent().
+            session_service (BaseSessionService, optional): Defaults to a
+                BoundedSessionService with its default limits.
+        """
         self.config = get_llm_config("appointment")
+        self.limiter = get_llm_limiter(self.config["provider"], self.config["model"])
+        self.discovery = DiscoveryClient(health_interval=15.0)
+        self.connectors: ConnectorPool = get_connector_pool()
+        self.catalog = AgentCatalog(self.discovery, exclude=["appointment_agent"]) if prompt_catalog else None
         self.orchestrator = self._build_orchestrator()
         self.user_id = "appointment_user"
         self.runner = Runner(
             app_name=self.orchestrator.name,
             agent=self.orchestrator,
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=session_service or BoundedSessionService(),
             memory_service=InMemoryMemoryService(),
         )
-        self.discovery = DiscoveryClient()
-        self.connectors: dict[str, AgentConnector] = {}
+        self.response_cache = response_cache  # Opt-in; see agents/response_cache.py
 
     def _build_orchestrator(self) -> LlmAgent:
         async def list_agents() -> list[dict]:
@@ -38,28 +61,38 @@ class AppointmentAgent:
             return [card.model_dump(exclude_none=True) for card in cards]
 
         async def call_agent(agent_name: str, message: str) -> str:
-            cards = await self.discovery.list_agent_cards()
-            matched = next((c for c in cards if agent_name.lower() in c.name.lower()), None)
+            await self.discovery.refresh()
+            matched = self.discovery.find_by_name(agent_name)
             if not matched:
-                raise ValueError(f"Agent '{agent_name}' not found.")
-            if matched.name not in self.connectors:
-                self.connectors[matched.name] = AgentConnector(matched.name, matched.url)
-            connector = self.connectors[matched.name]
-            task = await connector.send_task(message, session_id=self.user_id)
+                raise ValueError(f"Agent '{agent_name}' not found or currently unavailable.")
+            connector = self.connectors.get(matched, discovery=self.discovery)
+            task = await connector.send_task(message, session_id=self.user_id, history_length=1)
             return task.history[-1].parts[0].text if task.history else "No response"
 
-        tools = [FunctionTool(list_agents), FunctionTool(call_agent)]
+        if self.catalog is not None:
+            instruction = self.catalog.instruction("Use call_agent() to route users to proper specialists.")
+            tools = [FunctionTool(call_agent)]
+        else:
+            instruction = "Use list_agents() and call_agent() to route users to proper specialists."
+            tools = [FunctionTool(list_agents), FunctionTool(call_agent)]
         return LlmAgent(
-            provider=self.config["provider"],
-            model=self.config["model"],
-            api_key=self.config["api_key"],
+            model=self.config["model"],  # provider/api_key come from the environment, not LlmAgent
             name="appointment_orchestrator",
             description="Handles appointment requests for healthcare.",
-            instruction="Use list_agents() and call_agent() to route users to proper specialists.",
-            tools=tools
+            instruction=instruction,
+            tools=tools,
+            **self.limiter.adk_callbacks()
         )
 
     async def invoke(self, query: str, session_id: str) -> str:
+        reply = ""
+        async for update in self.stream(query, session_id):
+            if update.final:
+                reply = update.text
+        return reply
+
+    async def stream(self, query: str, session_id: str) -> AsyncIterator[AgentUpdate]:
+        """Run one turn, yielding progress as it happens and the reply as the last, `final` update."""
         session = await self.runner.session_service.get_session(
             app_name=self.orchestrator.name,
             user_id=self.user_id,
@@ -72,7 +105,31 @@ class AppointmentAgent:
         )
 
         content = types.Content(role="user", parts=[types.Part.from_text(text=query)])
+        key = None
+        if self.response_cache is not None:
+            key = cache_key(self.config["model"], query, session_fingerprint(session))
+            cached = await self.response_cache.get(key)
+            if cached is not None:
+                await append_cached_turn(self.runner.session_service, session, self.orchestrator.name, content, cached)
+                yield AgentUpdate(text=cached, final=True, metadata={"cached": True})
+                return
+
         last_event = None
-        async for event in self.runner.run_async(self.user_id, session.id, new_message=content):
-            last_event = event
-        return "\n".join(p.text for p in last_event.content.parts if p.text) if last_event else ""
+        called_tools = False
+        streamed = False  # Partial chunks sent since the last complete event
+        async with self.limiter.slot(session_id):
+            async for event in self.runner.run_async(
+                user_id=self.user_id, session_id=session.id, new_message=content, run_config=STREAMING
+            ):
+                # In SSE mode ADK follows the partial chunks with one aggregated
+                # event repeating their text, so only its tool calls are new
+                for update in updates_from_event(event, text_streamed=streamed):
+                    yield update
+                streamed = bool(event.partial)
+                if not event.partial:
+                    last_event = event
+                    called_tools = called_tools or used_tools(event)
+        reply = "\n".join(p.text for p in last_event.content.parts if p.text) if last_event and last_event.content else ""
+        if key is not None and reply and not called_tools:
+            await self.response_cache.put(key, reply)
+        yield AgentUpdate(text=reply, final=True)
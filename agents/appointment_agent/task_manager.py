@@ -10,12 +10,15 @@
 # =============================================================================
 
 import logging
+from typing import AsyncIterator
+
 from server.task_manager import InMemoryTaskManager
-from models.request import SendTaskRequest, SendTaskResponse
-from models.task import Message, TaskStatus, TaskState, TextPart
+from server.task_store import TaskStore
+from server.worker_pool import WorkerPool
+from models.task import AgentUpdate, TaskSendParams
 from agents.appointment_agent.agent import AppointmentAgent  # 👈 Updated import
 
-logger = logging.getLogger(_name_)
+logger = logging.getLogger(__name__)
 
 
 class AppointmentTaskManager(InMemoryTaskManager):
@@ -23,32 +26,26 @@ class AppointmentTaskManager(InMemoryTaskManager):
     🏥 TaskManager that handles appointment scheduling requests by invoking the AppointmentAgent.
     """
 
-    def _init_(self, agent: AppointmentAgent):
-        super()._init_()
+    def __init__(self, agent: AppointmentAgent, worker_pool: WorkerPool | None = None,
+                 store: TaskStore | None = None):
+        super().__init__(worker_pool=worker_pool, store=store)
         self.agent = agent
 
-    def _get_user_text(self, request: SendTaskRequest) -> str:
-        return request.params.message.parts[0].text
-
-    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
-        logger.info(f"📩 AppointmentTaskManager received task {request.params.id}")
+    def _get_user_text(self, params: TaskSendParams) -> str:
+        return params.message.parts[0].text
 
-        task = await self.upsert_task(request.params)
-        user_text = self._get_user_text(request)
+    async def invoke_agent(self, params: TaskSendParams) -> str:
+        logger.info(f"📩 AppointmentTaskManager received task {params.id}")
 
         # 🧠 Call the orchestrator agent to handle the appointment intent
-        agent_reply = await self.agent.invoke(
-            user_text,
-            request.params.sessionId
-        )
-
-        reply_message = Message(
-            role="agent",
-            parts=[TextPart(text=agent_reply)]
+        return await self.agent.invoke(
+            self._get_user_text(params),
+            params.sessionId
         )
 
-        async with self.lock:
-            task.status = TaskStatus(state=TaskState.COMPLETED)
-            task.history.append(reply_message)
+    async def stream_agent(self, params: TaskSendParams) -> AsyncIterator[AgentUpdate]:
+        logger.info(f"📡 AppointmentTaskManager streaming task {params.id}")
 
-        return SendTaskResponse(id=request.id, result=task)
\ No newline at end of file
+        # 🧠 Forward tool calls and partial text while the orchestrator works
+        async for update in self.agent.stream(self._get_user_text(params), params.sessionId):
+            yield update
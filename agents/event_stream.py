@@ -0,0 +1,55 @@
+# =============================================================================
+# agents/event_stream.py
+# =============================================================================
+# Purpose:
+# Maps ADK runner events to AgentUpdates, so the ADK-based agents can stream
+# progress (tool calls, delegation results, partial text) to A2A clients
+# through tasks/sendSubscribe instead of going silent until the reply.
+# =============================================================================
+
+from typing import List
+
+from models.task import AgentUpdate
+
+MAX_PREVIEW = 200  # Characters of tool arguments/results included in progress text
+
+
+def _preview(value) -> str:
+    text = " ".join(str(value).split())
+    return text if len(text) <= MAX_PREVIEW else text[:MAX_PREVIEW - 3] + "..."
+
+
+def event_text(event) -> str:
+    content = getattr(event, "content", None)
+    return "".join(p.text for p in (content.parts or []) if getattr(p, "text", None)) if content else ""
+
+
+def updates_from_event(event, text_streamed: bool = False) -> List[AgentUpdate]:
+    """
+    Progress updates for one ADK event. The final response is not included;
+    the caller reports it as the `final` reply once the run ends.
+
+    Args:
+        event: ADK event from Runner.run_async().
+        text_streamed (bool): Partial chunks of this (aggregated, non-partial)
+            event were already sent, so only its tool calls/results are new.
+    """
+    updates = []
+    for call in event.get_function_calls():
+        args = ", ".join(f"{k}={_preview(v)!r}" for k, v in (call.args or {}).items())
+        updates.append(AgentUpdate(
+            kind="tool_call", text=f"Calling {call.name}({args})",
+            metadata={"tool": call.name, "args": call.args or {}}
+        ))
+    for response in event.get_function_responses():
+        updates.append(AgentUpdate(
+            kind="tool_result", text=f"{response.name} returned: {_preview(response.response)}",
+            metadata={"tool": response.name}
+        ))
+
+    text = event_text(event)
+    if text and event.partial:
+        updates.append(AgentUpdate(kind="partial", text=text))
+    elif text and not text_streamed and not event.is_final_response():
+        updates.append(AgentUpdate(kind="message", text=text))  # e.g. reasoning before a tool call
+    return updates
@@ -31,7 +31,7 @@ class OrchestratorAgent:
             )
         )
 
-        self.discovery = AgentDiscovery("agent_registry.json")
+        self.discovery = AgentDiscovery()
         self.task_manager = TaskManager(discovery=self.discovery)
         self.server = A2AServer(
             host="localhost",
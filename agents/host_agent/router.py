@@ -0,0 +1,101 @@
+# =============================================================================
+# agents/host_agent/router.py
+# =============================================================================
+# Purpose:
+# Compiled intent router for the host agent.
+# - Routes are declared in routing_rules.json: per agent, keywords/phrases
+#   with weights
+# - All keywords compile into one trie-shaped regex, so a message is scanned
+#   once no matter how many routes exist
+# - Returns agents ranked by total matched weight; ties go to the route
+#   declared first
+# =============================================================================
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_RULES = Path(__file__).parent / "routing_rules.json"
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation that shares common prefixes, e.g.
+    ['head', 'headache', 'heart'] -> 'he(?:a(?:d(?:ache)?|rt))'. The regex
+    engine then walks the trie instead of trying every keyword per position.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of word
+
+    def emit(node: Dict[str, dict]) -> str:
+        ends = "" in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            body = "(?:" + body + ")?" if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return emit(trie)
+
+
+class IntentRouter:
+    """
+    Scores a message against weighted keyword routes in a single pass.
+
+    Args:
+        routes (list[dict]): `{"agent": str, "keywords": {keyword: weight} | [keyword, ...],
+            "weight": float}` in priority order; list keywords use the route `weight` (default 1).
+        default (str, optional): Agent returned when nothing matches.
+    """
+
+    def __init__(self, routes: List[dict], default: Optional[str] = None):
+        self.default = default
+        self.agents: List[str] = []
+        self._weights: Dict[str, List[Tuple[int, float]]] = {}
+
+        for route in routes:
+            agent = route["agent"]
+            if agent not in self.agents:
+                self.agents.append(agent)
+            rank = self.agents.index(agent)
+            keywords = route.get("keywords", {})
+            if not isinstance(keywords, dict):
+                keywords = dict.fromkeys(keywords, route.get("weight", 1.0))
+            for keyword, weight in keywords.items():
+                key = " ".join(keyword.lower().split())
+                if key:
+                    self._weights.setdefault(key, []).append((rank, float(weight)))
+
+        # Longest match wins at each position; keywords must start on a word boundary,
+        # and may be followed by a suffix ("appointment" matches "appointments")
+        pattern = _trie_pattern(self._weights)
+        self._regex = re.compile(r"(?<!\w)(?:" + pattern + ")") if pattern else None
+
+    @classmethod
+    def from_file(cls, path=None) -> "IntentRouter":
+        with open(path or DEFAULT_RULES, "r") as f:
+            rules = json.load(f)
+        return cls(rules.get("routes", []), default=rules.get("default"))
+
+    def rank(self, message: str) -> List[Tuple[str, float]]:
+        """All matching agents as (agent, score), best first."""
+        if self._regex is None:
+            return []
+        scores: Dict[int, float] = {}
+        for match in self._regex.finditer(" ".join(message.lower().split())):
+            for rank, weight in self._weights[match.group()]:
+                scores[rank] = scores.get(rank, 0.0) + weight
+        ordered = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.agents[rank], score) for rank, score in ordered]
+
+    def route(self, message: str) -> Optional[str]:
+        """Best matching agent, or the default route when nothing matches."""
+        ranked = self.rank(message)
+        return ranked[0][0] if ranked else self.default
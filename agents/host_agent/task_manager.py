@@ -1,41 +1,109 @@
 # agents/host_agent/task_manager.py
 
+import asyncio
 import logging
-from utilities.a2a.agent_connect import AgentConnector
+from uuid import uuid4
+
+from agents.host_agent.router import IntentRouter
+from models.task import Message, Task, TaskState, TaskStatus, TextPart
+from utilities.a2a.connector_pool import ConnectorPool, get_connector_pool
 
 logger = logging.getLogger(__name__)
 
 class TaskManager:
-    def __init__(self, discovery):
+    def __init__(self, discovery, router: IntentRouter = None, fan_out: bool = True,
+                 max_agents: int = 3, deadline: float = 30.0, connectors: ConnectorPool = None):
+        """
+        Args:
+            discovery (AgentDiscovery): Registry used to resolve agent names.
+            router (IntentRouter, optional): Defaults to the rules in routing_rules.json.
+            fan_out (bool): Send to every matching agent concurrently and merge the
+                answers, instead of only the best match.
+            max_agents (int): Most agents one message is fanned out to.
+            deadline (float): Seconds to wait for fanned-out agents; late ones are dropped.
+            connectors (ConnectorPool, optional): Defaults to the process-wide pool.
+        """
         self.discovery = discovery
+        self.router = router or IntentRouter.from_file()
+        self.fan_out = fan_out
+        self.max_agents = max_agents
+        self.deadline = deadline
+        self.connectors = connectors or get_connector_pool()
 
     async def handle_task(self, task):
         """
-        Route the task to the appropriate healthcare agent based on intent.
+        Route the task to the best-scoring healthcare agent (rules in routing_rules.json),
+        or to every matching agent at once when the message needs several.
         """
-        message = task.message.parts[0].text.lower()
+        message = task.message.parts[0].text  # Forwarded as written; the router matches case-insensitively
         session_id = task.session_id
 
         logger.info(f"[TaskManager] Routing message: {message}")
 
-        if any(keyword in message for keyword in ["fever", "headache", "cough", "pain"]):
-            return await self._delegate("SymptomCheckerAgent", message, session_id)
-
-        elif "appointment" in message or "book" in message:
-            return await self._delegate("AppointmentAgent", message, session_id)
-
-        elif "record" in message or "history" in message:
-            return await self._delegate("HealthRecordsAgent", message, session_id)
+        ranked = self.router.rank(message)
+        if not ranked:
+            logger.warning(f"[TaskManager] Unrecognized task. Defaulting to {self.router.default}.")
+            return await self._delegate(self.router.default, message, session_id)
 
-        else:
-            logger.warning("[TaskManager] Unrecognized task. Defaulting to SymptomCheckerAgent.")
-            return await self._delegate("SymptomCheckerAgent", message, session_id)
+        if self.fan_out and len(ranked) > 1:
+            agents = [agent for agent, _ in ranked[:self.max_agents]]
+            return await self._fan_out(agents, message, session_id, task_id=getattr(task, "id", None))
+        return await self._delegate(ranked[0][0], message, session_id)
 
-    async def _delegate(self, agent_name: str, message: str, session_id: str):
-        """Use AgentConnector to send task to remote agent."""
+    async def _delegate(self, agent_name: str, message: str, session_id: str, history_length: int = None):
+        """Send the task to a remote agent through its pooled AgentConnector."""
+        await self.discovery.refresh()
         agent = self.discovery.find_by_name(agent_name)
         if not agent:
             raise ValueError(f"Agent '{agent_name}' not found in registry")
 
-        connector = AgentConnector(name=agent_name, base_url=agent.url)
-        return await connector.send_task(message, session_id)
+        connector = self.connectors.get(agent, discovery=self.discovery)
+        return await connector.send_task(message, session_id, history_length=history_length)
+
+    async def _fan_out(self, agent_names: list[str], message: str, session_id: str, task_id: str = None) -> Task:
+        """Send the message to several agents concurrently and merge what arrives before the deadline."""
+        logger.info(f"[TaskManager] Fanning out to {', '.join(agent_names)}")
+        jobs = {
+            asyncio.ensure_future(self._delegate(name, message, session_id, history_length=1)): name
+            for name in agent_names
+        }
+        done, pending = await asyncio.wait(jobs, timeout=self.deadline)
+        for job in pending:
+            job.cancel()
+        # Collect the cancellations so no downstream call or exception is left orphaned
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        results = []
+        for job, name in jobs.items():  # Keep routing rank order in the merged answer
+            if job in pending:
+                results.append((name, None, f"no answer within {self.deadline:g}s"))
+            elif job.exception() is not None:
+                results.append((name, None, str(job.exception()) or type(job.exception()).__name__))
+            else:
+                results.append((name, job.result(), None))
+            if results[-1][2]:
+                logger.warning(f"[TaskManager] {name} failed during fan-out: {results[-1][2]}")
+        return self._merge(message, session_id, results, task_id=task_id)
+
+    @staticmethod
+    def _merge(message: str, session_id: str, results: list[tuple], task_id: str = None) -> Task:
+        """Combine per-agent Tasks into one Task (keeping the caller's task id) with a sectioned agent reply."""
+        sections = []
+        for name, task, error in results:
+            if task is None:
+                sections.append(f"[{name}]\nUnavailable: {error}")
+                continue
+            reply = next((m for m in reversed(task.history) if m.role == "agent"), None)
+            text = "\n".join(p.text for p in reply.parts) if reply else "No response"
+            sections.append(f"[{name}]\n{text}")
+
+        answered = any(task is not None for _, task, _ in results)
+        return Task(
+            id=task_id or uuid4().hex,
+            sessionId=session_id,
+            status=TaskStatus(state=TaskState.COMPLETED if answered else TaskState.FAILED),
+            history=[
+                Message(role="user", parts=[TextPart(text=message)]),
+                Message(role="agent", parts=[TextPart(text="\n\n".join(sections))]),
+            ]
+        )
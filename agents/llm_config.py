@@ -23,3 +23,25 @@ def get_llm_config(agent: str):
         }
     else:
         raise ValueError(f"Unknown agent type: {agent}")
+
+
+# Published free-tier quotas; override per deployment with <PROVIDER>_RPM,
+# <PROVIDER>_TPM and <PROVIDER>_MAX_CONCURRENCY (e.g. GROQ_RPM=60).
+PROVIDER_LIMITS = {
+    "groq": {"rpm": 30, "tpm": 6000, "max_concurrency": 8},
+    "gemini": {"rpm": 15, "tpm": 1_000_000, "max_concurrency": 8},
+}
+
+MODEL_LIMITS = {
+    ("groq", "llama3-8b-8192"): {"rpm": 30, "tpm": 30000},
+}
+
+def get_rate_limits(provider: str, model: str):
+    limits = {"rpm": None, "tpm": None, "max_concurrency": None}
+    limits.update(PROVIDER_LIMITS.get(provider, {}))
+    limits.update(MODEL_LIMITS.get((provider, model), {}))
+    for key in limits:
+        value = os.getenv(f"{provider.upper()}_{key.upper()}")
+        if value:
+            limits[key] = int(value) if key == "max_concurrency" else float(value)
+    return limits
@@ -0,0 +1,298 @@
+# =============================================================================
+# agents/rate_limiter.py
+# =============================================================================
+# Purpose:
+# Shared limiter for LLM provider calls, so concurrent agent invocations
+# smooth their demand instead of bursting into provider 429s.
+# - One limiter per provider+model (process-wide, see get_llm_limiter)
+# - Token buckets for requests-per-minute and tokens-per-minute; token use is
+#   estimated before a call and settled from the provider's usage report
+# - Optional cap on concurrent agent runs per provider+model
+# - Fair queuing: waiting sessions are served round-robin, FIFO within a
+#   session, so one chatty session cannot starve the others
+# - Wait times are exported as metrics
+# =============================================================================
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from agents.llm_config import get_rate_limits
+from utilities.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+LLM_WAIT = REGISTRY.histogram(
+    "a2a_llm_limiter_wait_seconds", "Time spent waiting for LLM rate/concurrency budget", ["provider", "model", "kind"]
+)
+LLM_QUEUED = REGISTRY.gauge("a2a_llm_limiter_queued", "Callers waiting on the LLM limiter", ["provider", "model", "kind"])
+
+DEFAULT_OUTPUT_TOKENS = 256  # Assumed completion size when the request sets no max_output_tokens
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket.
+
+    Args:
+        per_minute (float): Refill rate.
+        capacity (float, optional): Burst size; defaults to one minute's worth.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` (capped at capacity) can be taken; 0 if it can be now."""
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= amount  # May go negative when usage exceeds the estimate; later callers repay it
+
+
+class _FairQueue:
+    """Waiters grouped by session; sessions take turns, FIFO within a session."""
+
+    def __init__(self):
+        self._sessions: "OrderedDict[str, Deque[Tuple[Any, asyncio.Future]]]" = OrderedDict()
+        self.size = 0
+
+    def push(self, session: str, item: Any, future: asyncio.Future):
+        self._sessions.setdefault(session, deque()).append((item, future))
+        self.size += 1
+
+    def peek(self) -> Optional[Tuple[str, Any, asyncio.Future]]:
+        for session, waiters in self._sessions.items():
+            item, future = waiters[0]
+            return session, item, future
+        return None
+
+    def pop(self, session: str):
+        waiters = self._sessions.pop(session)
+        waiters.popleft()
+        self.size -= 1
+        if waiters:
+            self._sessions[session] = waiters  # Back of the rotation
+
+    def remove(self, session: str, future: asyncio.Future):
+        waiters = self._sessions.get(session)
+        for entry in list(waiters or []):
+            if entry[1] is future:
+                waiters.remove(entry)
+                self.size -= 1
+        if waiters is not None and not waiters:
+            del self._sessions[session]
+
+
+class LLMRateLimiter:
+    """
+    Rate and concurrency governor for one provider+model.
+
+    Args:
+        provider (str): Metric label, e.g. "groq".
+        model (str): Metric label, e.g. "llama3-70b-8192".
+        rpm (float, optional): Requests per minute; None means unlimited.
+        tpm (float, optional): Tokens (prompt + completion) per minute; None means unlimited.
+        max_concurrency (int, optional): Agent runs in flight at once; None means unlimited.
+    """
+
+    def __init__(self, provider: str, model: str, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 max_concurrency: Optional[int] = None):
+        self.provider = provider
+        self.model = model
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+
+        self._rate_queue = _FairQueue()
+        self._slot_queue = _FairQueue()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._pending_estimates: Dict[str, int] = {}
+
+    # -------------------------------------------------------------------------
+    # Queue pumping
+    # -------------------------------------------------------------------------
+    def _update_gauges(self):
+        LLM_QUEUED.set(self._rate_queue.size, provider=self.provider, model=self.model, kind="rate")
+        LLM_QUEUED.set(self._slot_queue.size, provider=self.provider, model=self.model, kind="slot")
+
+    def _pump_rate(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while (head := self._rate_queue.peek()) is not None:
+            session, tokens, future = head
+            if future.done():  # Cancelled while queued
+                self._rate_queue.pop(session)
+                continue
+            wait = max(
+                self.requests.time_until(1) if self.requests else 0.0,
+                self.tokens.time_until(tokens) if self.tokens else 0.0,
+            )
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._pump_rate)
+                break
+            self._rate_queue.pop(session)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+            future.set_result(None)
+        self._update_gauges()
+
+    def _pump_slots(self):
+        while (head := self._slot_queue.peek()) is not None:
+            if self.max_concurrency and self.in_flight >= self.max_concurrency:
+                break
+            session, _, future = head
+            self._slot_queue.pop(session)
+            if future.done():  # Cancelled while queued
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+        self._update_gauges()
+
+    async def _wait(self, queue: _FairQueue, pump, session: str, item: Any, kind: str, on_abandon):
+        future = asyncio.get_running_loop().create_future()
+        queue.push(session, item, future)
+        started = time.monotonic()
+        pump()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                on_abandon()  # Granted just before the cancellation landed
+            else:
+                queue.remove(session, future)
+                pump()  # It may have been blocking the head of the queue
+            raise
+        finally:
+            LLM_WAIT.observe(time.monotonic() - started, provider=self.provider, model=self.model, kind=kind)
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+    async def acquire(self, session: str = "default", tokens: int = 0):
+        """
+        Wait until one request and `tokens` tokens fit the per-minute budgets, then take them.
+
+        Args:
+            session (str): Fairness key; waiting sessions are served round-robin.
+            tokens (int): Estimated prompt + completion tokens (see settle()).
+        """
+        if not self.requests and not self.tokens:
+            return
+
+        def refund():
+            if self.requests:
+                self.requests.take(-1)
+            if self.tokens:
+                self.tokens.take(-tokens)
+
+        await self._wait(self._rate_queue, self._pump_rate, session, tokens, "rate", refund)
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once the provider reports real usage."""
+        if self.tokens and actual:
+            self.tokens.take(actual - estimated)
+
+    @asynccontextmanager
+    async def slot(self, session: str = "default"):
+        """Hold one of `max_concurrency` run slots for the duration of the block."""
+        if not self.max_concurrency:
+            yield
+            return
+        await self._wait(self._slot_queue, self._pump_slots, session, None, "slot", self._release_slot)
+        try:
+            yield
+        finally:
+            self._release_slot()
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        self._pump_slots()
+
+    # -------------------------------------------------------------------------
+    # ADK integration
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _estimate(llm_request) -> int:
+        """Rough token count: ~4 characters per token, plus the expected completion."""
+        chars = sum(
+            len(part.text or "") for content in llm_request.contents or [] for part in content.parts or []
+        )
+        config = getattr(llm_request, "config", None)
+        completion = getattr(config, "max_output_tokens", None) or DEFAULT_OUTPUT_TOKENS
+        return chars // 4 + completion
+
+    def adk_callbacks(self) -> Dict[str, Any]:
+        """
+        LlmAgent model callbacks that pass every model call through this limiter:
+        LlmAgent(..., **limiter.adk_callbacks()).
+        """
+        async def before_model(callback_context, llm_request):
+            estimate = self._estimate(llm_request)
+            self._pending_estimates[callback_context.invocation_id] = estimate
+            await self.acquire(callback_context.session.id, estimate)
+            return None
+
+        async def after_model(callback_context, llm_response):
+            if getattr(llm_response, "partial", False):
+                return None  # Streaming chunk; usage is settled once on the complete response
+            usage = getattr(llm_response, "usage_metadata", None)
+            estimate = self._pending_estimates.pop(callback_context.invocation_id, 0)
+            if usage is not None and usage.total_token_count:
+                self.settle(estimate, usage.total_token_count)
+            return None
+
+        async def on_model_error(callback_context, llm_request, error):
+            self._pending_estimates.pop(callback_context.invocation_id, None)
+            return None
+
+        return {
+            "before_model_callback": before_model,
+            "after_model_callback": after_model,
+            "on_model_error_callback": on_model_error,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued_rate": self._rate_queue.size,
+            "queued_slot": self._slot_queue.size,
+            "requests_available": self.requests.level if self.requests else None,
+            "tokens_available": self.tokens.level if self.tokens else None,
+        }
+
+
+_limiters: Dict[Tuple[str, str], LLMRateLimiter] = {}
+
+
+def get_llm_limiter(provider: str, model: str) -> LLMRateLimiter:
+    """Process-wide limiter for provider+model, created on first use from llm_config's PROVIDER_LIMITS."""
+    key = (provider, model)
+    if key not in _limiters:
+        _limiters[key] = LLMRateLimiter(provider, model, **get_rate_limits(provider, model))
+    return _limiters[key]
+
+
+def configure_llm_limiter(provider: str, model: str, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                          max_concurrency: Optional[int] = None) -> LLMRateLimiter:
+    """Replace the limiter for provider+model (call at startup, before agents are built)."""
+    _limiters[(provider, model)] = LLMRateLimiter(provider, model, rpm, tpm, max_concurrency)
+    return _limiters[(provider, model)]
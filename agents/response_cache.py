@@ -0,0 +1,227 @@
+# =============================================================================
+# agents/response_cache.py
+# =============================================================================
+# Purpose:
+# Opt-in cache of final LLM replies for the ADK-based agents.
+# - Keyed by model, normalized prompt and a fingerprint of the session
+#   (state + prior turns), so a hit only happens when the agent would be
+#   answering the same question in the same context
+# - TTL expiry and LRU eviction at `max_entries`
+# - In-memory backend, or a local SQLite file that survives restarts
+# - Turns that called tools are never cached: their replies depend on side
+#   effects (bookings, downstream agents) that must actually happen
+# =============================================================================
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from utilities.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CACHE_LOOKUPS = REGISTRY.counter("a2a_llm_cache_lookups_total", "LLM response cache lookups", ["agent", "result"])
+
+
+def normalize_prompt(text: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", text).strip().lower().rstrip("?!. ")
+
+
+def cache_key(model: str, prompt: str, context: str = "") -> str:
+    payload = json.dumps([model, normalize_prompt(prompt), context], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def session_fingerprint(session) -> str:
+    """Hash of an ADK session's state and the text of its previous turns."""
+    turns = []
+    for event in getattr(session, "events", None) or []:
+        content = getattr(event, "content", None)
+        text = " ".join(p.text for p in (content.parts or []) if getattr(p, "text", None)) if content else ""
+        if text:
+            turns.append([event.author, text])
+    payload = json.dumps([getattr(session, "state", None) or {}, turns], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def used_tools(event) -> bool:
+    content = getattr(event, "content", None)
+    return bool(content and any(getattr(p, "function_call", None) for p in content.parts or []))
+
+
+async def append_cached_turn(session_service, session, author: str, content, reply: str):
+    """Record a cache hit in the ADK session so later turns see the same history as a live run."""
+    from google.adk.events import Event
+    from google.genai import types
+
+    invocation_id = f"cache-{uuid.uuid4().hex}"
+    await session_service.append_event(session, Event(invocation_id=invocation_id, author="user", content=content))
+    await session_service.append_event(session, Event(
+        invocation_id=invocation_id,
+        author=author,
+        content=types.Content(role="model", parts=[types.Part.from_text(text=reply)])
+    ))
+
+
+class ResponseCache(ABC):
+    """
+    Base class for reply caches.
+
+    Args:
+        ttl (float): Seconds an entry stays valid.
+        max_entries (int): Least recently used entries are evicted beyond this.
+        name (str): Metric label (usually the agent name).
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 10_000, name: str = "agent"):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+            CACHE_LOOKUPS.inc(agent=self.name, result="miss")
+        else:
+            self.hits += 1
+            CACHE_LOOKUPS.inc(agent=self.name, result="hit")
+        return value
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def put(self, key: str, value: str):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class InMemoryResponseCache(ResponseCache):
+    """Process-local LRU cache."""
+
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 10_000, name: str = "agent"):
+        super().__init__(ttl, max_entries, name)
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+    async def _get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created_at, value = entry
+        if time.time() - created_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def put(self, key: str, value: str):
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    SQLite-backed cache shared across restarts. Database work runs on one
+    background thread so the event loop never blocks on disk I/O.
+
+    Args:
+        path (str): Database file (created if missing).
+    """
+
+    def __init__(self, path: str = "responses.db", ttl: float = 3600.0, max_entries: int = 10_000,
+                 name: str = "agent"):
+        super().__init__(ttl, max_entries, name)
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="response-cache")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._count = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access)")
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+            self._count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return self._conn
+
+    def _get_sync(self, key: str) -> Optional[str]:
+        conn = self._connect()
+        row = conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.ttl:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+            self._count -= 1
+            return None
+        conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        conn.commit()
+        return row[0]
+
+    def _put_sync(self, key: str, value: str):
+        conn = self._connect()
+        now = time.time()
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO responses (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+            (key, value, now, now)
+        ).rowcount
+        if inserted:
+            self._count += 1
+        else:
+            conn.execute(
+                "UPDATE responses SET value = ?, created_at = ?, last_access = ? WHERE key = ?", (value, now, now, key)
+            )
+        overflow = self._count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            )
+            self._count -= overflow
+            self.evictions += overflow
+        conn.commit()
+
+    async def _get(self, key: str) -> Optional[str]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._get_sync, key)
+
+    async def put(self, key: str, value: str):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._put_sync, key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "entries": self._count}
+
+    async def close(self):
+        def _close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        await asyncio.get_running_loop().run_in_executor(self._executor, _close)
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,202 @@
+# =============================================================================
+# agents/session_service.py
+# =============================================================================
+# Purpose:
+# Drop-in replacement for ADK's InMemorySessionService that keeps memory and
+# prompt size bounded for long-running agents.
+# - At most `max_sessions` sessions; the least recently used is evicted
+# - Sessions idle for longer than `idle_ttl` seconds are dropped
+# - Histories beyond `max_turns` user turns are compacted when the session is
+#   loaded: older events are either dropped ("truncate") or folded into a
+#   single summary event ("summarize")
+# =============================================================================
+
+import inspect
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, Union
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.genai import types
+
+from utilities.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SESSION_EVICTIONS = REGISTRY.counter("a2a_sessions_evicted_total", "Agent sessions evicted", ["reason"])
+SESSION_COMPACTIONS = REGISTRY.counter("a2a_session_compactions_total", "Agent session histories compacted", ["mode"])
+
+SUMMARY_PREFIX = "[Summary of earlier conversation]"
+
+Summarizer = Callable[[List[Event]], Union[str, Awaitable[str]]]
+
+
+def _event_text(event: Event) -> str:
+    content = event.content
+    return " ".join(p.text for p in (content.parts or []) if p.text) if content else ""
+
+
+def _is_summary(event: Event) -> bool:
+    return bool(event.custom_metadata and event.custom_metadata.get("compaction_summary"))
+
+
+def extractive_summary(events: List[Event], max_chars: int = 2000, max_line: int = 200) -> str:
+    """
+    Cheap, model-free summary: one shortened line per text event, keeping the
+    most recent ones when the budget runs out. Tool calls are skipped, and an
+    earlier summary contributes its lines as they are.
+    """
+    candidates = []
+    for event in events:
+        if _is_summary(event):
+            candidates.extend(_event_text(event).splitlines()[1:])
+            continue
+        text = " ".join(_event_text(event).split())
+        if text:
+            if len(text) > max_line:
+                text = text[:max_line - 3].rstrip() + "..."
+            candidates.append(f"{event.author}: {text}")
+
+    lines, used = [], 0
+    for line in reversed(candidates):
+        if used + len(line) > max_chars:
+            break
+        lines.append(line)
+        used += len(line) + 1
+    return "\n".join(reversed(lines))
+
+
+class BoundedSessionService(InMemorySessionService):
+    """
+    InMemorySessionService with LRU/TTL eviction and history compaction.
+
+    Args:
+        max_sessions (int): Most sessions kept across all apps and users.
+        idle_ttl (float, optional): Seconds without access before a session is dropped.
+        max_turns (int, optional): User turns kept verbatim; None disables compaction.
+        compaction (str): "truncate" drops older events, "summarize" replaces them
+            with one summary event.
+        summarizer (callable, optional): `(events) -> str` (sync or async) used by
+            "summarize"; defaults to extractive_summary. Plug in an LLM call here
+            for abstractive summaries.
+    """
+
+    def __init__(self, max_sessions: int = 1000, idle_ttl: Optional[float] = 3600.0,
+                 max_turns: Optional[int] = 20, compaction: str = "truncate",
+                 summarizer: Optional[Summarizer] = None):
+        super().__init__()
+        if compaction not in ("truncate", "summarize"):
+            raise ValueError(f"Unknown compaction mode: {compaction}")
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_turns = max_turns
+        self.compaction = compaction
+        self.summarizer = summarizer or extractive_summary
+        # (app_name, user_id, session_id) -> last access, least recently used first
+        self._access: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict()
+
+    # -------------------------------------------------------------------------
+    # Eviction
+    # -------------------------------------------------------------------------
+    def _touch(self, key: Tuple[str, str, str]):
+        self._access[key] = time.monotonic()
+        self._access.move_to_end(key)
+
+    def _drop(self, key: Tuple[str, str, str], reason: str):
+        self._access.pop(key, None)
+        app_name, user_id, session_id = key
+        user_sessions = self.sessions.get(app_name, {}).get(user_id)
+        if user_sessions is None or user_sessions.pop(session_id, None) is None:
+            return
+        if not user_sessions:
+            del self.sessions[app_name][user_id]
+        SESSION_EVICTIONS.inc(reason=reason)
+        logger.info(f"[Sessions] Evicted session {session_id} ({reason})")
+
+    def _evict(self):
+        if self.idle_ttl is not None:
+            cutoff = time.monotonic() - self.idle_ttl
+            while self._access:
+                key, last_access = next(iter(self._access.items()))
+                if last_access > cutoff:
+                    break
+                self._drop(key, "ttl")
+        while len(self._access) > self.max_sessions:
+            self._drop(next(iter(self._access)), "lru")
+
+    # -------------------------------------------------------------------------
+    # Compaction
+    # -------------------------------------------------------------------------
+    async def _compact(self, session: Session):
+        """Shrink the stored history in place once it exceeds `max_turns` user turns."""
+        if self.max_turns is None:
+            return
+        turn_starts = [
+            i for i, event in enumerate(session.events) if event.author == "user" and not _is_summary(event)
+        ]
+        if len(turn_starts) <= self.max_turns:
+            return
+
+        # Cut on a turn boundary so tool calls and their responses stay together
+        cut = turn_starts[-self.max_turns]
+        older, recent = session.events[:cut], session.events[cut:]
+        if self.compaction == "summarize":
+            summary = self.summarizer(older)
+            if inspect.isawaitable(summary):
+                summary = await summary
+            if summary:
+                recent = [Event(
+                    invocation_id=f"compaction-{uuid.uuid4().hex}",
+                    author="user",
+                    content=types.Content(role="user", parts=[types.Part.from_text(text=f"{SUMMARY_PREFIX}\n{summary}")]),
+                    timestamp=older[-1].timestamp,
+                    custom_metadata={"compaction_summary": True},
+                )] + recent
+        session.events = recent
+        SESSION_COMPACTIONS.inc(mode=self.compaction)
+        logger.info(f"[Sessions] Compacted session {session.id}: {len(older)} older events ({self.compaction})")
+
+    # -------------------------------------------------------------------------
+    # BaseSessionService
+    # -------------------------------------------------------------------------
+    async def create_session(self, *, app_name: str, user_id: str, state: Optional[dict[str, Any]] = None,
+                             session_id: Optional[str] = None) -> Session:
+        self._evict()
+        session = await super().create_session(app_name=app_name, user_id=user_id, state=state,
+                                               session_id=session_id)
+        self._touch((app_name, user_id, session.id))
+        self._evict()
+        return session
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str, config=None) -> Optional[Session]:
+        self._evict()
+        key = (app_name, user_id, session_id.strip() if session_id else session_id)
+        stored = self.sessions.get(app_name, {}).get(user_id, {}).get(key[2])
+        if stored is None:
+            return None
+        self._touch(key)
+        # The Runner loads the session at the start of every turn, so compacting
+        # here bounds the prompt of the turn about to run
+        await self._compact(stored)
+        return await super().get_session(app_name=app_name, user_id=user_id, session_id=session_id, config=config)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._access.pop((app_name, user_id, session_id), None)
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        key = (session.app_name, session.user_id, session.id)
+        if key in self._access:
+            self._touch(key)
+        return await super().append_event(session=session, event=event)
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._access),
+            "events": sum(
+                len(s.events) for users in self.sessions.values() for sessions in users.values() for s in sessions.values()
+            ),
+        }
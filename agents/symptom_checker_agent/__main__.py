@@ -5,6 +5,11 @@ import uvicorn
 from server.server import A2AServer
 from models.agent import AgentCard, AgentCapabilities, AgentCapability, AgentSkill
 from agents.symptom_checker_agent.agent import SymptomCheckerAgent
+from agents.symptom_checker_agent.task_manager import SymptomTaskManager
+from server.worker_pool import WorkerPool
+from server.sqlite_task_store import SQLiteTaskStore
+from agents.response_cache import DiskResponseCache
+from agents.session_service import BoundedSessionService
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,10 +17,32 @@ logger = logging.getLogger(__name__)
 @click.command()
 @click.option("--host", default="localhost", help="Host to bind SymptomCheckerAgent server")
 @click.option("--port", default=10020, help="Port to bind SymptomCheckerAgent server")
-def main(host: str, port: int):
+@click.option("--workers", default=0, help="Run tasks in the background on N workers (0 = answer tasks/send synchronously)")
+@click.option("--task-db", default=None, help="Persist tasks to this SQLite file instead of keeping them in memory")
+@click.option("--max-concurrency", default=0, help="Max agent runs in flight (0 = unbounded)")
+@click.option("--max-queue", default=0, help="Requests allowed to wait once --max-concurrency is reached")
+@click.option("--history-length", default=0,
+              help="Cap on history messages returned when a request sets no historyLength (0 = full history)")
+@click.option("--response-cache", default=None, help="Cache LLM replies in this SQLite file (off by default)")
+@click.option("--response-cache-ttl", default=3600.0, help="Seconds a cached LLM reply stays valid")
+@click.option("--prompt-catalog/--no-prompt-catalog", default=True,
+              help="List downstream agents in the instruction instead of via a list_agents() tool call")
+@click.option("--max-sessions", default=1000, help="Conversation sessions kept in memory (least recently used evicted)")
+@click.option("--session-ttl", default=3600.0, help="Drop sessions idle this many seconds (0 = never)")
+@click.option("--max-turns", default=20, help="User turns kept verbatim per session (0 = unlimited)")
+@click.option("--compaction", type=click.Choice(["truncate", "summarize"]), default="truncate",
+              help="What happens to turns beyond --max-turns")
+def main(host: str, port: int, workers: int, task_db: str, max_concurrency: int, max_queue: int,
+         history_length: int, response_cache: str, response_cache_ttl: float, prompt_catalog: bool,
+         max_sessions: int, session_ttl: float, max_turns: int, compaction: str):
     logger.info(f"🩺 Starting SymptomCheckerAgent on http://{host}:{port}/")
 
-    agent_logic = SymptomCheckerAgent()
+    response_cache = DiskResponseCache(response_cache, ttl=response_cache_ttl, name="symptom_checker_agent") if response_cache else None
+    agent_logic = SymptomCheckerAgent(
+        response_cache=response_cache,
+        prompt_catalog=prompt_catalog,
+        session_service=BoundedSessionService(max_sessions, session_ttl or None, max_turns or None, compaction),
+    )
 
     agent_card = AgentCard(
         id="symptom_checker_agent",
@@ -37,7 +64,17 @@ def main(host: str, port: int):
         ])
     )
 
-    server = A2AServer(agent_card=agent_card, task_manager=agent_logic)
+    worker_pool = WorkerPool(max_workers=workers) if workers > 0 else None
+    store = SQLiteTaskStore(task_db) if task_db else None
+    task_manager = SymptomTaskManager(agent_logic, worker_pool=worker_pool, store=store)
+
+    server = A2AServer(
+        agent_card=agent_card,
+        task_manager=task_manager,
+        max_concurrency=max_concurrency or None,
+        max_queue=max_queue,
+        default_history_length=history_length or None
+    )
     uvicorn.run(server.app, host=host, port=port)
 
 if __name__ == "__main__":
@@ -1,39 +1,62 @@
 import logging
+from typing import AsyncIterator
 from dotenv import load_dotenv
 
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import BaseSessionService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.tools.function_tool import FunctionTool
 from google.genai import types
 
+from models.task import AgentUpdate
 from utilities.a2a.agent_discovery import AgentDiscovery
-from utilities.a2a.agent_connect import AgentConnector
+from utilities.a2a.connector_pool import ConnectorPool, get_connector_pool
+from agents.agent_catalog import AgentCatalog
 from agents.llm_config import get_llm_config
+from agents.event_stream import updates_from_event
+from agents.rate_limiter import get_llm_limiter
+from agents.session_service import BoundedSessionService
+from agents.response_cache import ResponseCache, append_cached_turn, cache_key, session_fingerprint, used_tools
 
 logger = logging.getLogger(__name__)
 load_dotenv()
 
+# Partial text arrives as it is generated, so stream() can forward it
+STREAMING = RunConfig(streaming_mode=StreamingMode.SSE)
+
 class SymptomCheckerAgent:
-    def __init__(self):
+    def __init__(self, response_cache: ResponseCache = None, prompt_catalog: bool = True,
+                 session_service: BaseSessionService = None):
+        """
+        Args:
+            response_cache (ResponseCache, optional): Reuse replies to repeated questions.
+            prompt_catalog (bool): Render the agent catalog into the instruction so
+                delegating takes one call_agent() instead of list_agents() + call_agent().
+            session_service (BaseSessionService, optional): Defaults to a
+                BoundedSessionService with its default limits.
+        """
         # ✅ Load config with model only — don't pass provider/api_key to LlmAgent
         self.config = get_llm_config("symptom_checker")
         self.model = self.config.get("model")
 
         if not self.model:
             raise ValueError("Missing model in config.")
+        self.limiter = get_llm_limiter(self.config["provider"], self.model)
 
-        self.discovery = AgentDiscovery()
-        self.connectors: dict[str, AgentConnector] = {}
+        self.response_cache = response_cache  # Opt-in; see agents/response_cache.py
+        self.discovery = AgentDiscovery(health_interval=15.0)
+        self.connectors: ConnectorPool = get_connector_pool()
+        self.catalog = AgentCatalog(self.discovery, exclude=["symptom_checker_agent"]) if prompt_catalog else None
         self.orchestrator = self._build_orchestrator()
         self.user_id = "symptom_user"
         self.runner = Runner(
             app_name=self.orchestrator.name,
             agent=self.orchestrator,
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=session_service or BoundedSessionService(),
             memory_service=InMemoryMemoryService(),
         )
 
@@ -43,39 +66,62 @@ class SymptomCheckerAgent:
             return [card.model_dump(exclude_none=True) for card in cards]
 
         async def call_agent(agent_name: str, message: str) -> str:
-            cards = await self.discovery.list_agent_cards()
-            matched = next((c for c in cards if agent_name.lower() in c.name.lower()), None)
+            await self.discovery.refresh()
+            matched = self.discovery.find_by_name(agent_name)
             if not matched:
-                raise ValueError(f"Agent '{agent_name}' not found.")
-            if matched.name not in self.connectors:
-                self.connectors[matched.name] = AgentConnector(name=matched.name, base_url=matched.url)
-            connector = self.connectors[matched.name]
-            task = await connector.send_task(message, session_id=self.user_id)
+                raise ValueError(f"Agent '{agent_name}' not found or currently unavailable.")
+            connector = self.connectors.get(matched, discovery=self.discovery)
+            task = await connector.send_task(message, session_id=self.user_id, history_length=1)
             return task.history[-1].parts[0].text if task.history else "No response"
 
-        system_instruction = (
-            "You are a Symptom Checker Assistant. "
-            "Your job is to:\n"
-            "- Analyze a user's symptoms\n"
-            "- Suggest a probable condition OR\n"
-            "- Route the user to an appropriate specialist by calling list_agents() "
-            "and then call_agent(agent_name, message).\n\n"
-            "Example:\n"
-            "If a user says 'I have skin rashes', call list_agents(), find 'Dermatologist', "
-            "and delegate with call_agent()."
-        )
-
-        tools = [FunctionTool(list_agents), FunctionTool(call_agent)]
+        if self.catalog is not None:
+            system_instruction = self.catalog.instruction(
+                "You are a Symptom Checker Assistant. "
+                "Your job is to:\n"
+                "- Analyze a user's symptoms\n"
+                "- Suggest a probable condition OR\n"
+                "- Route the user to an appropriate specialist from the list below "
+                "with call_agent(agent_name, message).\n\n"
+                "Example:\n"
+                "If a user says 'I have skin rashes', find 'Dermatologist' below "
+                "and delegate with call_agent()."
+            )
+            tools = [FunctionTool(call_agent)]
+        else:
+            system_instruction = (
+                "You are a Symptom Checker Assistant. "
+                "Your job is to:\n"
+                "- Analyze a user's symptoms\n"
+                "- Suggest a probable condition OR\n"
+                "- Route the user to an appropriate specialist by calling list_agents() "
+                "and then call_agent(agent_name, message).\n\n"
+                "Example:\n"
+                "If a user says 'I have skin rashes', call list_agents(), find 'Dermatologist', "
+                "and delegate with call_agent()."
+            )
+            tools = [FunctionTool(list_agents), FunctionTool(call_agent)]
 
         return LlmAgent(
             model=self.model,
             name="symptom_checker_orchestrator",
             description="Analyzes symptoms and delegates to appropriate healthcare agents.",
             instruction=system_instruction,
-            tools=tools
+            tools=tools,
+            **self.limiter.adk_callbacks()
         )
 
     async def invoke(self, query: str, session_id: str) -> str:
+        reply = "No response generated."
+        async for update in self.stream(query, session_id):
+            if update.final:
+                reply = update.text
+        return reply
+
+    async def stream(self, query: str, session_id: str) -> AsyncIterator[AgentUpdate]:
+        """
+        Run one turn, yielding progress (tool calls, delegation results, partial
+        text) as it happens and the reply as the last, `final` update.
+        """
         session = await self.runner.session_service.get_session(
             app_name=self.orchestrator.name,
             user_id=self.user_id,
@@ -88,11 +134,36 @@ class SymptomCheckerAgent:
         )
 
         content = types.Content(role="user", parts=[types.Part.from_text(text=query)])
+        key = None
+        if self.response_cache is not None:
+            key = cache_key(self.model, query, session_fingerprint(session))
+            cached = await self.response_cache.get(key)
+            if cached is not None:
+                await append_cached_turn(self.runner.session_service, session, self.orchestrator.name, content, cached)
+                yield AgentUpdate(text=cached, final=True, metadata={"cached": True})
+                return
+
         last_event = None
-        async for event in self.runner.run_async(self.user_id, session.id, new_message=content):
-            last_event = event
+        called_tools = False
+        streamed = False  # Partial chunks sent since the last complete event
+        async with self.limiter.slot(session_id):
+            async for event in self.runner.run_async(
+                user_id=self.user_id, session_id=session.id, new_message=content, run_config=STREAMING
+            ):
+                # In SSE mode ADK follows the partial chunks with one aggregated
+                # event repeating their text, so only its tool calls are new
+                for update in updates_from_event(event, text_streamed=streamed):
+                    yield update
+                streamed = bool(event.partial)
+                if not event.partial:
+                    last_event = event
+                    called_tools = called_tools or used_tools(event)
 
         if not last_event or not last_event.content or not last_event.content.parts:
-            return "No response generated."
+            yield AgentUpdate(text="No response generated.", final=True)
+            return
 
-        return "\n".join([p.text for p in last_event.content.parts if p.text])
+        reply = "\n".join([p.text for p in last_event.content.parts if p.text])
+        if key is not None and reply and not called_tools:
+            await self.response_cache.put(key, reply)
+        yield AgentUpdate(text=reply, final=True)
@@ -18,8 +18,9 @@ from models.task import Task
 @click.option("--agent", default="http://localhost:10010", help="Base URL of the healthcare agent server")
 @click.option("--session", default=0, help="Session ID (use 0 to generate a new one)")
 @click.option("--history", is_flag=True, help="Print full task history after receiving a response")
+@click.option("--stream", is_flag=True, help="Use tasks/sendSubscribe and print updates as they arrive")
 
-async def cli(agent: str, session: str, history: bool):
+async def cli(agent: str, session: str, history: bool, stream: bool):
     """
     CLI for interacting with A2A healthcare agents.
 
@@ -27,6 +28,7 @@ async def cli(agent: str, session: str, history: bool):
         agent (str): Base URL of the agent server (e.g., AppointmentAgent)
         session (str): Reuse or auto-generate a session ID
         history (bool): If true, print entire task history after response
+        stream (bool): If true, stream status updates instead of waiting for the full reply
     """
     client = A2AClient(url=agent)
     session_id = uuid4().hex if str(session) == "0" else str(session)
@@ -48,6 +50,16 @@ async def cli(agent: str, session: str, history: bool):
         }
 
         try:
+            if stream:
+                async for event in client.send_task_streaming(payload):
+                    if event.error:
+                        print(f"\n❌ Error: {event.error.message}")
+                        break
+                    status = event.result.status
+                    text = status.message.parts[0].text if status.message else ""
+                    print(f"\n⏳ [{status.state}] {text}".rstrip())
+                continue
+
             task: Task = await client.send_task(payload)
 
             if task.history and len(task.history) > 1:
@@ -0,0 +1,89 @@
+# =============================================================================
+# benchmarks/bench_codec.py
+# =============================================================================
+# Purpose:
+# Micro-benchmark of A2AServer's JSON handling: the previous path
+# (json.loads -> validate_python, model_dump -> jsonable_encoder -> json.dumps)
+# versus the single-pass codec in server/codec.py, on tasks carrying
+# 10 / 100 / 1000 history messages.
+#
+# Usage:
+#   python -m benchmarks.bench_codec [--repeat 200]
+# =============================================================================
+
+import json
+import timeit
+
+import click
+from fastapi.encoders import jsonable_encoder
+
+from models.request import A2ARequest, SendTaskRequest, SendTaskResponse
+from models.task import Message, Task, TaskSendParams, TaskState, TaskStatus, TextPart
+from server.codec import decode_request, encode_response
+
+
+# -----------------------------------------------------------------------------
+# Previous server path (kept here only for comparison)
+# -----------------------------------------------------------------------------
+def decode_request_legacy(raw: bytes):
+    return A2ARequest.validate_python(json.loads(raw))
+
+
+def encode_response_legacy(response) -> bytes:
+    content = jsonable_encoder(response.model_dump(exclude_none=True))
+    # Same settings as starlette.responses.JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+# -----------------------------------------------------------------------------
+# Fixtures
+# -----------------------------------------------------------------------------
+def build_response(history_size: int) -> SendTaskResponse:
+    history = [
+        Message(
+            role="user" if i % 2 == 0 else "agent",
+            parts=[TextPart(text=f"Turn {i}: I have had a mild fever and a dry cough for {i % 7 + 1} days.")]
+        )
+        for i in range(history_size)
+    ]
+    task = Task(id="bench-task", sessionId="bench-session", status=TaskStatus(state=TaskState.COMPLETED), history=history)
+    return SendTaskResponse(id="bench-request", result=task)
+
+
+def build_request_body() -> bytes:
+    request = SendTaskRequest(
+        id="bench-request",
+        params=TaskSendParams(
+            id="bench-task",
+            sessionId="bench-session",
+            message=Message(role="user", parts=[TextPart(text="I have a fever, cough, and sore throat.")]),
+            metadata={"user_id": "user-001"},
+        ),
+    )
+    return request.model_dump_json().encode()
+
+
+def time_per_call(fn, arg, repeat: int) -> float:
+    return min(timeit.repeat(lambda: fn(arg), number=repeat, repeat=5)) / repeat
+
+
+@click.command()
+@click.option("--repeat", default=200, help="Calls per timing sample")
+def main(repeat: int):
+    body = build_request_body()
+    assert decode_request(body) == decode_request_legacy(body)
+    legacy = time_per_call(decode_request_legacy, body, repeat * 10)
+    fast = time_per_call(decode_request, body, repeat * 10)
+    print(f"{'decode request':<24}{legacy * 1e6:>12.1f} µs{fast * 1e6:>12.1f} µs{legacy / fast:>9.2f}x")
+
+    for size in (10, 100, 1000):
+        response = build_response(size)
+        assert json.loads(encode_response(response)) == json.loads(encode_response_legacy(response))
+        legacy = time_per_call(encode_response_legacy, response, repeat)
+        fast = time_per_call(encode_response, response, repeat)
+        print(f"{f'encode ({size} msgs)':<24}{legacy * 1e6:>12.1f} µs{fast * 1e6:>12.1f} µs{legacy / fast:>9.2f}x")
+
+
+if __name__ == "__main__":
+    print(f"{'':<24}{'legacy':>15}{'single-pass':>15}{'speedup':>10}")
+    main()
@@ -0,0 +1,83 @@
+# =============================================================================
+# benchmarks/bench_router.py
+# =============================================================================
+# Purpose:
+# Micro-benchmark of host-agent intent routing: the previous keyword cascade
+# (`any(keyword in message ...)` per route) versus the compiled IntentRouter
+# in agents/host_agent/router.py, on synthetic rule sets of growing size.
+#
+# Usage:
+#   python -m benchmarks.bench_router [--repeat 200] [--keywords-per-route 10]
+# =============================================================================
+
+import random
+import timeit
+
+import click
+
+from agents.host_agent.router import IntentRouter
+
+
+# -----------------------------------------------------------------------------
+# Previous routing (kept here only for comparison)
+# -----------------------------------------------------------------------------
+def route_cascade(routes, message: str, default: str):
+    message = message.lower()
+    for route in routes:
+        if any(keyword in message for keyword in route["keywords"]):
+            return route["agent"]
+    return default
+
+
+# -----------------------------------------------------------------------------
+# Fixtures
+# -----------------------------------------------------------------------------
+def build_routes(route_count: int, keywords_per_route: int, rng: random.Random):
+    syllables = ["ar", "be", "cor", "den", "ex", "fi", "gas", "hep", "im", "lu", "mal", "neu", "os", "pul", "ren", "sto"]
+    routes = []
+    for i in range(route_count):
+        keywords = {
+            "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) + f"{i}x{k}": 1.0
+            for k in range(keywords_per_route)
+        }
+        routes.append({"agent": f"Specialist{i}Agent", "keywords": keywords})
+    return routes
+
+
+def build_messages(routes, count: int, rng: random.Random):
+    filler = "i have had this problem for about three days and it is getting worse at night".split()
+    messages = []
+    for _ in range(count):
+        words = rng.sample(filler, 10)
+        words.insert(rng.randrange(len(words)), rng.choice(list(rng.choice(routes)["keywords"])))
+        messages.append(" ".join(words))
+    return messages
+
+
+def time_per_call(fn, messages, repeat: int) -> float:
+    total = min(timeit.repeat(lambda: [fn(m) for m in messages], number=repeat, repeat=3))
+    return total / (repeat * len(messages))
+
+
+@click.command()
+@click.option("--repeat", default=200, help="Passes over the message set per timing sample")
+@click.option("--keywords-per-route", default=10, help="Keywords in each synthetic route")
+def main(repeat: int, keywords_per_route: int):
+    rng = random.Random(7)
+    for route_count in (3, 30, 300, 1000):
+        routes = build_routes(route_count, keywords_per_route, rng)
+        messages = build_messages(routes, 20, rng)
+        router = IntentRouter(routes, default="Fallback")
+        for message in messages:
+            assert router.route(message) == route_cascade(routes, message, "Fallback")
+
+        samples = max(1, repeat * 3 // route_count)
+        cascade = time_per_call(lambda m: route_cascade(routes, m, "Fallback"), messages, samples)
+        compiled = time_per_call(router.route, messages, samples)
+        label = f"{route_count} routes ({route_count * keywords_per_route} kw)"
+        print(f"{label:<26}{cascade * 1e6:>12.1f} µs{compiled * 1e6:>12.1f} µs{cascade / compiled:>9.1f}x")
+
+
+if __name__ == "__main__":
+    print(f"{'':<26}{'cascade':>15}{'compiled':>15}{'speedup':>10}")
+    main()
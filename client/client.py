@@ -5,20 +5,34 @@
 # Async client to interact with healthcare agents over A2A protocol.
 # - Used to send tasks (e.g., symptom check, appointment booking)
 # - Retrieve task history or results
+# - Stream task progress over Server-Sent Events (tasks/sendSubscribe)
+# - Reuses pooled keep-alive connections (see client/http_pool.py)
+# - Retries idempotent calls and short-circuits failing agents
+#   (see client/resilience.py)
+# - Optionally hedges idempotent calls to a second replica (client/hedging.py)
+# - Sends many tasks concurrently with bounded fan-out (client/fanout.py)
+# - Packs several calls into one JSON-RPC batch round trip
 # =============================================================================
 
 import json
+import time
+import asyncio
 from uuid import uuid4
 import httpx
-from typing import Any
+from httpx_sse import aconnect_sse, SSEError
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Sequence
 
 # JSON-RPC models
-from models.request import SendTaskRequest, GetTaskRequest
+from models.request import SendTaskRequest, GetTaskRequest, CancelTaskRequest, SendTaskStreamingRequest, SendTaskStreamingResponse
 from models.json_rpc import JSONRPCRequest
 
 # Domain models
-from models.task import Task, TaskSendParams
+from models.task import Task, TaskSendParams, TaskState
 from models.agent import AgentCard
+from client.http_pool import A2AConnectionPool, get_shared_pool
+from client.resilience import NO_BREAKER, NO_RETRY, OPEN, CircuitBreaker, RetryPolicy, call_with_resilience, get_breaker
+from client.hedging import HedgePolicy, run_hedged
+from client.fanout import FanOutResult, fan_out
 
 
 # -----------------------------------------------------------------------------
@@ -26,27 +40,61 @@ from models.agent import AgentCard
 # -----------------------------------------------------------------------------
 class A2AClientHTTPError(Exception):
     """Raised on HTTP failure while communicating with healthcare agent."""
-    pass
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(status_code, message)
+        self.status_code = status_code
 
 class A2AClientJSONError(Exception):
     """Raised when the A2A server response is invalid JSON."""
     pass
 
 
+class A2AClientRPCError(Exception):
+    """Raised when the agent answers with a JSON-RPC error object."""
+    pass
+
+
 # -----------------------------------------------------------------------------
 # A2AClient: Communicates with healthcare agents via A2A protocol
 # -----------------------------------------------------------------------------
 class A2AClient:
-    def __init__(self, agent_card: AgentCard = None, url: str = None):
+    def __init__(self, agent_card: AgentCard = None, url: str = None, pool: A2AConnectionPool = None,
+                 retry: RetryPolicy = None, breaker: CircuitBreaker = None,
+                 hedge: HedgePolicy = None, replicas: Sequence[str] = None):
         """
         Initialize the client to talk to a healthcare agent via its URL or AgentCard.
+
+        Connections come from `pool`, or from the process-wide shared pool when
+        omitted, so many clients to the same agent reuse keep-alive connections.
+
+        Idempotent calls (get_task, get_agent_card) are retried per `retry`.
+        Every call goes through `breaker`, by default the process-wide breaker
+        for this URL, so all clients of one agent share its failure state.
+        NO_BREAKER bypasses circuit breaking altogether.
+
+        With `hedge` and other `replicas` of the same agent, a slow idempotent
+        call is duplicated to the next replica and the first answer wins.
+        Hedging tasks/get across replicas assumes they share a task store
+        (e.g. one SQLiteTaskStore database).
         """
         if agent_card:
-            self.url = agent_card.url
+            self.url = str(agent_card.url)
         elif url:
             self.url = url
         else:
             raise ValueError("You must provide either an AgentCard or a direct URL to the agent.")
+        self._pool = pool
+        self.retry = retry or RetryPolicy()
+        self.breaker = None if breaker is NO_BREAKER else (breaker or get_breaker(self.url))
+        self.hedge = hedge
+        self.replicas = [str(url) for url in (replicas or []) if str(url) != self.url]
+        self._backups: dict[str, "A2AClient"] = {}
+        self._next_backup = 0
+
+    @property
+    def pool(self) -> A2AConnectionPool:
+        return self._pool or get_shared_pool()
 
     # -------------------------------------------------------------------------
     # Send a user task to the agent
@@ -70,7 +118,120 @@ class A2AClient:
         print(json.dumps(request.model_dump(), indent=2))
 
         response = await self._send_request(request)
-        return Task(**response["result"])
+        return self._task_from_response(response)
+
+    # -------------------------------------------------------------------------
+    # Send many tasks concurrently
+    # -------------------------------------------------------------------------
+    async def send_tasks_many(self, payloads: Iterable[dict[str, Any] | TaskSendParams], concurrency: int = 8,
+                              timeout: float | None = None) -> AsyncIterator[FanOutResult]:
+        """
+        Send a batch of tasks with at most `concurrency` in flight, yielding
+        results as they complete.
+
+        Args:
+            payloads (iterable): Task payloads (dicts or TaskSendParams); consumed lazily
+            concurrency (int): Maximum concurrent requests
+            timeout (float, optional): Per-task timeout in seconds
+
+        Yields:
+            FanOutResult: `.index`/`.item` identify the payload; `.result` is the Task, or `.error` is set
+        """
+        async def _send(payload) -> Task:
+            if isinstance(payload, TaskSendParams):
+                payload = payload.model_dump()
+            return await self.send_task(payload)
+
+        async for outcome in fan_out(payloads, _send, concurrency=concurrency, timeout=timeout):
+            yield outcome
+
+    # -------------------------------------------------------------------------
+    # Send several calls in one JSON-RPC batch
+    # -------------------------------------------------------------------------
+    async def send_batch(self, requests: Sequence[JSONRPCRequest]) -> list[dict[str, Any]]:
+        """
+        POST a JSON-RPC 2.0 batch array; the agent runs the entries concurrently.
+
+        Args:
+            requests (list): JSON-RPC requests (tasks/send, tasks/get, tasks/cancel); ids must be unique
+
+        Returns:
+            list[dict]: Raw JSON-RPC responses in the same order as `requests`
+        """
+        requests = list(requests)
+        responses = await call_with_resilience(lambda: self._post(requests), self.breaker)
+        if not isinstance(responses, list):
+            error = responses.get("error") or {}
+            raise A2AClientRPCError(error.get("code"), error.get("message"))
+
+        by_id = {response.get("id"): response for response in responses}
+        missing = {"error": {"code": -32603, "message": "No response for batch entry"}}
+        return [by_id.get(request.id, missing) for request in requests]
+
+    async def send_tasks_batch(self, payloads: Iterable[dict[str, Any] | TaskSendParams]) -> list[Task | Exception]:
+        """
+        Send several tasks in one round trip.
+
+        Returns:
+            list: A Task, or the A2AClientRPCError for that entry, per payload in order
+        """
+        requests = [
+            SendTaskRequest(id=uuid4().hex, params=p if isinstance(p, TaskSendParams) else TaskSendParams(**p))
+            for p in payloads
+        ]
+        return [self._task_or_error(response) for response in await self.send_batch(requests)]
+
+    async def get_tasks_batch(self, payloads: Iterable[dict[str, Any]]) -> list[Task | Exception]:
+        """
+        Fetch several tasks in one round trip (payloads as for get_task).
+
+        Returns:
+            list: A Task, or the A2AClientRPCError for that entry, per payload in order
+        """
+        requests = [GetTaskRequest(id=uuid4().hex, params=payload) for payload in payloads]
+        return [self._task_or_error(response) for response in await self.send_batch(requests)]
+
+    @classmethod
+    def _task_or_error(cls, response: dict[str, Any]) -> Task | Exception:
+        try:
+            return cls._task_from_response(response)
+        except A2AClientRPCError as e:
+            return e
+
+    # -------------------------------------------------------------------------
+    # Send a user task and stream progress as it happens
+    # -------------------------------------------------------------------------
+    async def send_task_streaming(self, payload: dict[str, Any]) -> AsyncIterator[SendTaskStreamingResponse]:
+        """
+        Sends a task via tasks/sendSubscribe and yields status updates
+        (WORKING, partial agent text, final state) as the agent emits them.
+
+        Args:
+            payload (dict): JSON-RPC task payload
+
+        Yields:
+            SendTaskStreamingResponse: One event per SSE frame; the last one has result.final=True
+        """
+        request = SendTaskStreamingRequest(
+            id=uuid4().hex,
+            params=TaskSendParams(**payload)
+        )
+
+        async with self.pool.slot(self.url) as client:
+            try:
+                async with aconnect_sse(client, "POST", self.url, json=request.model_dump(mode="json"), timeout=None) as event_source:
+                    event_source.response.raise_for_status()
+                    async for sse in event_source.aiter_sse():
+                        yield SendTaskStreamingResponse(**json.loads(sse.data))
+
+            except httpx.HTTPStatusError as e:
+                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+
+            except SSEError as e:
+                raise A2AClientHTTPError(400, str(e)) from e
+
+            except json.JSONDecodeError as e:
+                raise A2AClientJSONError(str(e)) from e
 
     # -------------------------------------------------------------------------
     # Fetch a previously sent task (status/history)
@@ -86,19 +247,135 @@ class A2AClient:
             Task: Task object with full history and metadata
         """
         request = GetTaskRequest(params=payload)
+        response = await self._hedged(lambda client: client._send_request(request, idempotent=True))
+        return self._task_from_response(response)
+
+    # -------------------------------------------------------------------------
+    # Abort a task running in the background
+    # -------------------------------------------------------------------------
+    async def cancel_task(self, payload: dict[str, Any]) -> Task:
+        """
+        Cancel a queued or running background task.
+
+        Args:
+            payload (dict): must include 'id'
+
+        Returns:
+            Task: The task in CANCELED state
+        """
+        request = CancelTaskRequest(params=payload)
         response = await self._send_request(request)
+        return self._task_from_response(response)
+
+    # -------------------------------------------------------------------------
+    # Poll a background task until it reaches a terminal state
+    # -------------------------------------------------------------------------
+    async def wait_for_task(self, task_id: str, poll_interval: float = 0.5,
+                            timeout: float | None = None, history_length: int | None = None) -> Task:
+        """
+        Poll tasks/get until the task is completed, failed or canceled.
+
+        Args:
+            task_id (str): ID returned by send_task in background mode
+            poll_interval (float): Seconds between polls
+            timeout (float, optional): Give up after this many seconds (raises TimeoutError)
+            history_length (int, optional): Only return the last N history messages
+
+        Returns:
+            Task: The task in its terminal state
+        """
+        terminal = {TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED}
+
+        async def _poll() -> Task:
+            while True:
+                task = await self.get_task({"id": task_id, "historyLength": history_length})
+                if task.status.state in terminal:
+                    return task
+                await asyncio.sleep(poll_interval)
+
+        return await asyncio.wait_for(_poll(), timeout)
+
+    # -------------------------------------------------------------------------
+    # Fetch the agent's published card
+    # -------------------------------------------------------------------------
+    async def get_agent_card(self, timeout: float | None = None) -> AgentCard:
+        """
+        Fetch /.well-known/agent.json from the agent's origin.
+
+        Args:
+            timeout (float, optional): Override the pool's request timeout
+
+        Returns:
+            AgentCard: The card the agent currently advertises
+        """
+        return await self._hedged(lambda client: client._fetch_agent_card(timeout))
+
+    async def _fetch_agent_card(self, timeout: float | None) -> AgentCard:
+        card_url = str(httpx.URL(self.url).join("/.well-known/agent.json"))
+
+        async def _fetch() -> AgentCard:
+            async with self.pool.slot(card_url) as client:
+                try:
+                    kwargs = {"timeout": timeout} if timeout is not None else {}
+                    response = await client.get(card_url, **kwargs)
+                    response.raise_for_status()
+                    return AgentCard(**response.json())
+
+                except httpx.HTTPStatusError as e:
+                    raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+
+                except json.JSONDecodeError as e:
+                    raise A2AClientJSONError(str(e)) from e
+
+        return await call_with_resilience(_fetch, self.breaker, self.retry)
+
+    # -------------------------------------------------------------------------
+    # Internal: Hedge idempotent calls across replicas
+    # -------------------------------------------------------------------------
+    def _backup_client(self) -> "A2AClient | None":
+        """Next replica (round-robin) whose circuit is not open."""
+        for _ in range(len(self.replicas)):
+            url = self.replicas[self._next_backup % len(self.replicas)]
+            self._next_backup += 1
+            backup = self._backups.get(url)
+            if backup is None:
+                backup = self._backups[url] = A2AClient(url=url, pool=self._pool, retry=self.retry)
+            if backup.breaker is None or backup.breaker.state != OPEN:
+                return backup
+        return None
+
+    async def _hedged(self, call: Callable[["A2AClient"], Awaitable[Any]]) -> Any:
+        backup = self._backup_client() if self.hedge else None
+        if backup is None:
+            return await call(self)
+
+        start = time.perf_counter()
+        result = await run_hedged(lambda: call(self), lambda: call(backup), self.hedge.delay(), backup.url)
+        self.hedge.record(time.perf_counter() - start)
+        return result
+
+    @staticmethod
+    def _task_from_response(response: dict[str, Any]) -> Task:
+        if response.get("error"):
+            raise A2AClientRPCError(response["error"].get("code"), response["error"].get("message"))
         return Task(**response["result"])
 
     # -------------------------------------------------------------------------
     # Internal: Perform JSON-RPC HTTP POST
     # -------------------------------------------------------------------------
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
+    async def _send_request(self, request: JSONRPCRequest, idempotent: bool = False) -> dict[str, Any]:
+        """POST through the circuit breaker; only idempotent requests are retried."""
+        return await call_with_resilience(
+            lambda: self._post(request), self.breaker, self.retry if idempotent else NO_RETRY
+        )
+
+    async def _post(self, request: JSONRPCRequest | list[JSONRPCRequest]) -> Any:
+        body = [r.model_dump() for r in request] if isinstance(request, list) else request.model_dump()
+        async with self.pool.slot(self.url) as client:
             try:
                 response = await client.post(
                     self.url,
-                    json=request.model_dump(),
-                    timeout=60
+                    json=body
                 )
                 response.raise_for_status()
                 return response.json()
@@ -0,0 +1,101 @@
+# =============================================================================
+# client/fanout.py
+# =============================================================================
+# Purpose:
+# Bounded-concurrency fan-out for bulk A2A work (e.g. nightly triage
+# re-checks over thousands of patients).
+# - At most `concurrency` calls are in flight at once
+# - Each call gets its own timeout; failures are reported, not raised
+# - Results are yielded as they complete, and input is consumed lazily so
+#   large batches never materialize all at once
+# =============================================================================
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+
+class FanOutResult:
+    """
+    Outcome of one fanned-out call.
+
+    Attributes:
+        index (int): Position of the item in the input.
+        item: The input item.
+        result: Return value of the call (None on failure).
+        error (Exception): Raised exception or asyncio.TimeoutError (None on success).
+    """
+
+    __slots__ = ("index", "item", "result", "error")
+
+    def __init__(self, index: int, item: Any, result: Any = None, error: Optional[Exception] = None):
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome = f"error={self.error!r}" if self.error else "ok"
+        return f"FanOutResult(index={self.index}, {outcome})"
+
+
+_DONE = object()
+
+
+async def fan_out(items: Iterable[Any], fn: Callable[[Any], Awaitable[Any]], concurrency: int = 8,
+                  timeout: Optional[float] = None) -> AsyncIterator[FanOutResult]:
+    """
+    Call `fn(item)` for every item with at most `concurrency` calls in flight,
+    yielding a FanOutResult per item in completion order.
+
+    Args:
+        items (iterable): Inputs; pulled one at a time as workers free up.
+        fn (callable): Async function applied to each item.
+        concurrency (int): Maximum concurrent calls.
+        timeout (float, optional): Per-item timeout in seconds.
+
+    Raises:
+        Exception: Whatever `items` raised while being iterated, once the calls
+            already started have been yielded.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    iterator = enumerate(items)
+    # Bounded so a slow consumer pauses the workers instead of buffering everything
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    iterator_error: Optional[Exception] = None
+
+    async def worker():
+        nonlocal iterator_error
+        try:
+            for index, item in iterator:  # Workers share the iterator; each takes the next item
+                try:
+                    outcome = FanOutResult(index, item, result=await asyncio.wait_for(fn(item), timeout))
+                except Exception as e:
+                    outcome = FanOutResult(index, item, error=e)
+                await results.put(outcome)
+        except Exception as e:  # Raised by `items` itself; fn errors are reported per item above
+            iterator_error = iterator_error or e
+        # Not in a `finally`: a cancelled worker must not block on a full queue
+        await results.put(_DONE)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        remaining = len(workers)
+        while remaining:
+            outcome = await results.get()
+            if outcome is _DONE:
+                remaining -= 1
+            else:
+                yield outcome
+        if iterator_error is not None:
+            raise iterator_error
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
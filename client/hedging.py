@@ -0,0 +1,88 @@
+# =============================================================================
+# client/hedging.py
+# =============================================================================
+# Purpose:
+# Hedged requests for idempotent A2A calls (tasks/get, agent card fetch).
+# - If the first request has not answered within a chosen percentile of
+#   recently observed latency, a second one goes to another replica
+# - Whichever answers first wins and the other is cancelled
+# - Cuts the tail caused by a single slow replica for the price of a few
+#   percent extra requests
+# =============================================================================
+
+import asyncio
+import math
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from utilities.metrics import REGISTRY
+
+HEDGES = REGISTRY.counter("a2a_hedged_requests_total", "Backup requests sent because the first was slow", ["url"])
+HEDGE_WINS = REGISTRY.counter("a2a_hedge_wins_total", "Hedged calls answered first by the backup request", ["url"])
+
+
+class HedgePolicy:
+    """
+    Decides when to send the backup request from a rolling latency window.
+
+    Args:
+        percentile (float): Hedge once the first request is slower than this
+            percentile of recent latencies (e.g. 95 -> roughly 5% extra load).
+        min_delay (float): Never hedge sooner than this many seconds.
+        window (int): Number of recent latencies kept.
+        min_samples (int): Do not hedge until this many latencies were observed.
+    """
+
+    def __init__(self, percentile: float = 95.0, min_delay: float = 0.005,
+                 window: int = 256, min_samples: int = 20):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+
+    def record(self, latency: float):
+        self._samples.append(latency)
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little data."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return max(self.min_delay, ordered[index])
+
+
+async def run_hedged(primary: Callable[[], Awaitable[Any]], backup: Callable[[], Awaitable[Any]],
+                     delay: Optional[float], backup_url: str = "") -> Any:
+    """
+    Run `primary`; if it is still pending after `delay` seconds, also run
+    `backup` and return the first successful result. A failure of one
+    request waits for the other; if both fail, the primary's error is raised.
+    """
+    first = asyncio.ensure_future(primary())
+    tasks = [first]
+    try:
+        if delay is None:
+            return await first
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return first.result()
+
+        HEDGES.inc(url=backup_url)
+        second = asyncio.ensure_future(backup())
+        tasks.append(second)
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    if task is second:
+                        HEDGE_WINS.inc(url=backup_url)
+                    return task.result()
+        return first.result()  # Both failed: surface the primary's error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
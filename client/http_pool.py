@@ -0,0 +1,114 @@
+# =============================================================================
+# client/http_pool.py
+# =============================================================================
+# Purpose:
+# Long-lived, pooled HTTP transport for A2A calls.
+# - One httpx.AsyncClient (keep-alive connections, optional HTTP/2) reused
+#   across every agent-to-agent hop instead of one client per request
+# - Per-host connection cap so one busy agent cannot starve the others
+# - A process-wide shared pool used by default by A2AClient/AgentConnector
+# =============================================================================
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+from urllib.parse import urlsplit
+
+import httpx
+
+
+class A2AConnectionPool:
+    """
+    Owns a keep-alive httpx.AsyncClient shared by A2A clients.
+
+    Use it as an async context manager (or call `aclose()`) to release the
+    connections; it is lazily (re)opened on first use.
+
+    Args:
+        max_connections (int): Total open connections across all agents.
+        max_connections_per_host (int): Concurrent requests allowed per agent host.
+        max_keepalive_connections (int): Idle connections kept for reuse.
+        keepalive_expiry (float): Seconds an idle connection is kept open.
+        http2 (bool): Negotiate HTTP/2 (requires `httpx[http2]`).
+        timeout (float): Default request timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_connections_per_host: int = 20,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 60.0,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(limits=self.limits, http2=self.http2, timeout=self.timeout)
+        return self._client
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[httpx.AsyncClient]:
+        """Hold one of the per-host request slots for `url` while the caller uses the client."""
+        host = urlsplit(str(url)).netloc
+        semaphore = self._host_slots.get(host)
+        if semaphore is None:
+            semaphore = self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        async with semaphore:
+            yield self.client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_slots.clear()
+
+    async def __aenter__(self) -> "A2AConnectionPool":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+# -----------------------------------------------------------------------------
+# Process-wide shared pool
+# -----------------------------------------------------------------------------
+_shared_pool: A2AConnectionPool | None = None
+
+
+def get_shared_pool() -> A2AConnectionPool:
+    """Return the process-wide pool, creating it with default settings if needed."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = A2AConnectionPool()
+    return _shared_pool
+
+
+async def configure_shared_pool(**settings) -> A2AConnectionPool:
+    """
+    Replace the process-wide pool with one built from `settings`
+    (see A2AConnectionPool), closing the previous one.
+    """
+    global _shared_pool
+    if _shared_pool is not None:
+        await _shared_pool.aclose()
+    _shared_pool = A2AConnectionPool(**settings)
+    return _shared_pool
+
+
+async def close_shared_pool():
+    """Close the process-wide pool's connections (e.g., on server shutdown)."""
+    if _shared_pool is not None:
+        await _shared_pool.aclose()
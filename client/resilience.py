@@ -0,0 +1,210 @@
+# =============================================================================
+# client/resilience.py
+# =============================================================================
+# Purpose:
+# Failure handling for A2AClient.
+# - RetryPolicy: jittered exponential backoff, used only for idempotent calls
+#   (tasks/get, agent card fetch)
+# - CircuitBreaker: per-URL breaker that short-circuits calls while a
+#   downstream keeps failing, then lets a trial call through after a cool-down
+# - Breakers are shared per URL across all clients in the process, and their
+#   state is exported as metrics
+# =============================================================================
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from utilities.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = REGISTRY.gauge("a2a_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["url"])
+CIRCUIT_REJECTIONS = REGISTRY.counter("a2a_circuit_rejections_total", "Calls short-circuited by an open breaker", ["url"])
+RETRIES = REGISTRY.counter("a2a_client_retries_total", "Retried idempotent client calls", ["url"])
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a downstream whose breaker is open; `retry_after` is in seconds."""
+
+    def __init__(self, url: str, retry_after: float):
+        super().__init__(f"Circuit open for {url}, retry after {retry_after:.1f}s")
+        self.url = url
+        self.retry_after = retry_after
+
+
+def is_transient(error: Exception) -> bool:
+    """Connection problems, timeouts, 429 and 5xx are worth retrying and count against the breaker."""
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+# -----------------------------------------------------------------------------
+# Retry
+# -----------------------------------------------------------------------------
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        max_attempts (int): Total attempts, including the first call.
+        base_delay (float): Backoff ceiling for the first retry, in seconds.
+        max_delay (float): Upper bound for any single backoff.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.1, max_delay: float = 2.0):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+# -----------------------------------------------------------------------------
+# Circuit breaker
+# -----------------------------------------------------------------------------
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive transient failures;
+    open -> half-open after `reset_timeout` seconds; half-open -> closed on
+    a successful trial call, or back to open if it fails.
+
+    Args:
+        url (str): Downstream the breaker protects (metric label).
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds to stay open before allowing a trial call.
+        half_open_max_calls (int): Trial calls allowed at once while half-open.
+    """
+
+    def __init__(self, url: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        CIRCUIT_STATE.set(0, url=url)
+
+    def _set_state(self, state: str):
+        if state != self._state:
+            logger.info(f"[CircuitBreaker] {self.url}: {self._state} -> {state}")
+        self._state = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state], url=self.url)
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._set_state(HALF_OPEN)
+            self._trial_calls = 0
+        return self._state
+
+    def before_call(self):
+        """
+        Reserve permission for one call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its trial calls in use.
+        """
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+            self._trial_calls += 1
+            return
+        CIRCUIT_REJECTIONS.inc(url=self.url)
+        retry_after = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self.url, retry_after)
+
+    def record_success(self):
+        self._failures = 0
+        if self._state != CLOSED:
+            self._set_state(CLOSED)
+
+    def record_abandoned(self):
+        """The call was cancelled before an outcome; free its half-open trial slot."""
+        if self._state == HALF_OPEN and self._trial_calls > 0:
+            self._trial_calls -= 1
+
+    def record_failure(self):
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"url": self.url, "state": self.state, "consecutive_failures": self._failures}
+
+
+# Pass as A2AClient(breaker=NO_BREAKER) for calls that must neither trip nor be
+# blocked by the shared breaker, e.g. health probes
+NO_BREAKER = object()
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breaker_settings: Dict[str, Any] = {}
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """Process-wide breaker for `url`, created on first use."""
+    breaker = _breakers.get(url)
+    if breaker is None:
+        breaker = _breakers[url] = CircuitBreaker(url, **_breaker_settings)
+    return breaker
+
+
+def configure_breakers(**settings):
+    """Set CircuitBreaker settings for breakers created from now on (see CircuitBreaker)."""
+    _breaker_settings.update(settings)
+
+
+# -----------------------------------------------------------------------------
+# Call wrapper
+# -----------------------------------------------------------------------------
+async def call_with_resilience(fn: Callable[[], Awaitable[Any]], breaker: Optional[CircuitBreaker],
+                               retry: RetryPolicy = NO_RETRY) -> Any:
+    """
+    Run `fn` behind `breaker`, retrying transient failures per `retry`.
+    Non-transient errors (4xx, JSON-RPC errors) prove the downstream is
+    alive, so they close the breaker and are raised without retrying.
+    """
+    for attempt in range(1, retry.max_attempts + 1):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.record_abandoned()
+            raise
+        except Exception as e:
+            transient = is_transient(e)
+            if breaker is not None:
+                breaker.record_failure() if transient else breaker.record_success()
+            if not transient or attempt == retry.max_attempts:
+                raise
+            RETRIES.inc(url=breaker.url if breaker is not None else "")
+            delay = retry.backoff(attempt)
+            logger.warning(f"[Retry] Attempt {attempt} failed ({type(e).__name__}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
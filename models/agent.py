@@ -22,5 +22,6 @@ class AgentCard(BaseModel):
     description: Optional[str] = None
     version: Optional[str] = "1.0"
     url: Optional[HttpUrl] = None
+    urls: Optional[List[HttpUrl]] = None  # Replica endpoints; `url` is the first one
     capabilities: Optional[AgentCapabilities] = None
     tools: Optional[List[dict[str, str]]] = []
@@ -56,3 +56,41 @@ class InternalError(JSONRPCError):
     code: int = -32603
     message: str = "Internal error"
     data: Any | None = None
+
+# -----------------------------------------------------------------------------
+# InvalidRequestError
+# -----------------------------------------------------------------------------
+# Returned when a JSON-RPC request (or batch entry) is not a valid A2A call.
+class InvalidRequestError(JSONRPCError):
+    code: int = -32600
+    message: str = "Invalid request"
+    data: Any | None = None
+
+# -----------------------------------------------------------------------------
+# ServerBusyError
+# -----------------------------------------------------------------------------
+# Returned when an agent is saturated and sheds load; `data.retryAfter` tells
+# the caller how many seconds to back off before trying again.
+class ServerBusyError(JSONRPCError):
+    code: int = -32003
+    message: str = "Server busy"
+    data: Any | None = None
+
+# -----------------------------------------------------------------------------
+# TaskNotFoundError
+# -----------------------------------------------------------------------------
+# Returned by tasks/get or tasks/cancel when the task ID is unknown to the agent.
+class TaskNotFoundError(JSONRPCError):
+    code: int = -32001
+    message: str = "Task not found"
+    data: Any | None = None
+
+# -----------------------------------------------------------------------------
+# TaskNotCancelableError
+# -----------------------------------------------------------------------------
+# Returned by tasks/cancel when the task already finished or is not running
+# in the background.
+class TaskNotCancelableError(JSONRPCError):
+    code: int = -32002
+    message: str = "Task cannot be canceled"
+    data: Any | None = None
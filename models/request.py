@@ -13,6 +13,8 @@
 # The models support:
 # - Task submission ("tasks/send")
 # - Task retrieval ("tasks/get")
+# - Streaming task submission ("tasks/sendSubscribe")
+# - Task cancellation ("tasks/cancel")
 #
 # =============================================================================
 
@@ -24,7 +26,7 @@ from pydantic.type_adapter import TypeAdapter
 from models.json_rpc import JSONRPCRequest, JSONRPCResponse
 
 # Task input/output models
-from models.task import Task, TaskSendParams, TaskQueryParams
+from models.task import Task, TaskSendParams, TaskQueryParams, TaskIdParams, TaskStatusUpdateEvent
 
 
 # -----------------------------------------------------------------------------
@@ -47,16 +49,37 @@ class GetTaskRequest(JSONRPCRequest):
     params: TaskQueryParams
 
 
+# -----------------------------------------------------------------------------
+# SendTaskStreamingRequest
+# -----------------------------------------------------------------------------
+# Same payload as tasks/send, but the agent answers with a stream of
+# Server-Sent Events (status updates + partial text) instead of one response.
+class SendTaskStreamingRequest(JSONRPCRequest):
+    method: Literal["tasks/sendSubscribe"] = "tasks/sendSubscribe"
+    params: TaskSendParams
+
+
+# -----------------------------------------------------------------------------
+# CancelTaskRequest
+# -----------------------------------------------------------------------------
+# Aborts a task that is queued or running in the background.
+# Example: Patient closes the triage UI before the assessment finishes.
+class CancelTaskRequest(JSONRPCRequest):
+    method: Literal["tasks/cancel"] = "tasks/cancel"
+    params: TaskIdParams
+
+
 # -----------------------------------------------------------------------------
 # A2ARequest: Unified request parser (based on the `method` field)
 # -----------------------------------------------------------------------------
-# Supports both sending and retrieving tasks across agents.
+# Supports sending, streaming, retrieving and cancelling tasks across agents.
 A2ARequest = TypeAdapter(
     Annotated[
         Union[
             SendTaskRequest,
             GetTaskRequest,
-            # In future: CancelTaskRequest
+            SendTaskStreamingRequest,
+            CancelTaskRequest,
         ],
         Field(discriminator="method")
     ]
@@ -77,3 +100,19 @@ class SendTaskResponse(JSONRPCResponse):
 # Returned when a task is queried — includes full task details and history.
 class GetTaskResponse(JSONRPCResponse):
     result: Task | None = None
+
+
+# -----------------------------------------------------------------------------
+# CancelTaskResponse
+# -----------------------------------------------------------------------------
+# Returned when a task is cancelled — includes the task in CANCELED state.
+class CancelTaskResponse(JSONRPCResponse):
+    result: Task | None = None
+
+
+# -----------------------------------------------------------------------------
+# SendTaskStreamingResponse
+# -----------------------------------------------------------------------------
+# One SSE event of a tasks/sendSubscribe stream.
+class SendTaskStreamingResponse(JSONRPCResponse):
+    result: TaskStatusUpdateEvent | None = None
@@ -40,6 +40,7 @@ class Message(BaseModel):
 # -----------------------------------------------------------------------------
 class TaskStatus(BaseModel):
     state: str
+    message: Message | None = None  # Optional partial/interim agent message
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
@@ -48,10 +49,31 @@ class TaskStatus(BaseModel):
 # -----------------------------------------------------------------------------
 class Task(BaseModel):
     id: str                          # Unique identifier per task
+    sessionId: str | None = None     # Conversation the task belongs to
     status: TaskStatus               # Current state (submitted, working, etc.)
     history: List[Message]           # List of user-agent exchanges
 
 
+# -----------------------------------------------------------------------------
+# TaskStatusUpdateEvent: Streamed to clients subscribed via tasks/sendSubscribe
+# -----------------------------------------------------------------------------
+class TaskStatusUpdateEvent(BaseModel):
+    id: str                          # Task the update belongs to
+    status: TaskStatus               # New state, optionally with partial agent text
+    final: bool = False              # True on the last event of the stream
+    metadata: dict[str, Any] | None = None
+
+
+# -----------------------------------------------------------------------------
+# AgentUpdate: One item of an agent's stream() (server-side, not on the wire)
+# -----------------------------------------------------------------------------
+class AgentUpdate(BaseModel):
+    text: str                        # Progress text, or the full reply when final
+    kind: Literal["reply", "partial", "message", "tool_call", "tool_result"] = "reply"
+    final: bool = False              # True only for the reply, which ends the stream
+    metadata: dict[str, Any] | None = None  # e.g. {"tool": "call_agent", "args": {...}}
+
+
 # -----------------------------------------------------------------------------
 # Request Parameter Models
 # -----------------------------------------------------------------------------
@@ -0,0 +1,97 @@
+# =============================================================================
+# server/admission.py
+# =============================================================================
+# Purpose:
+# Admission control for A2AServer.
+# - At most `max_concurrency` agent runs (LLM + tools) execute at once
+# - Up to `max_queue` further requests wait for a slot
+# - Anything beyond that is rejected immediately with a retry-after hint,
+#   keeping latency predictable for the requests that were admitted
+# =============================================================================
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+
+class AdmissionRejected(Exception):
+    """Raised when the server is saturated; `retry_after` is in seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Server busy, retry after {retry_after:g}s")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounded-concurrency gate with a bounded wait queue.
+
+    Args:
+        max_concurrency (int): Requests allowed to run at the same time.
+        max_queue (int): Requests allowed to wait for a free slot.
+        queue_timeout (float, optional): Reject a queued request after waiting this long.
+        retry_after (float): Seconds clients are told to wait before retrying.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int = 0,
+                 queue_timeout: float | None = None, retry_after: float = 1.0):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    async def acquire(self):
+        """
+        Take a concurrency slot, waiting in the queue if needed. Every
+        successful acquire must be paired with one `release()`.
+
+        Raises:
+            AdmissionRejected: If both the slots and the queue are full, or the
+                queue wait exceeds `queue_timeout`.
+        """
+        if self._semaphore.locked() and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(self.retry_after)
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise AdmissionRejected(self.retry_after)
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        self.admitted += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a concurrency slot for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,74 @@
+# =============================================================================
+# server/codec.py
+# =============================================================================
+# Purpose:
+# Single-pass JSON codec for A2AServer.
+# - Requests are validated straight from the raw body bytes (no json.loads
+#   into dicts followed by a second validation pass)
+# - Responses are serialized from the Pydantic model straight to bytes (no
+#   model_dump -> jsonable_encoder -> json.dumps chain)
+# - JSON-RPC batch arrays are parsed once; each entry is validated on its own
+#   so one bad entry does not fail the whole batch
+# =============================================================================
+
+from functools import lru_cache
+from typing import Any, Iterable, List
+
+from pydantic import BaseModel, ValidationError
+from pydantic.type_adapter import TypeAdapter
+from pydantic_core import from_json
+
+from models.request import A2ARequest
+
+
+class InvalidBatchItem(ValueError):
+    """Stands in for a batch entry that failed validation; keeps its id for the error response."""
+
+    def __init__(self, request_id: Any, message: str):
+        super().__init__(message)
+        self.request_id = request_id
+
+
+def is_batch(raw: bytes) -> bool:
+    return raw.lstrip()[:1] == b"["
+
+
+def decode_request(raw: bytes):
+    """Parse and validate a JSON-RPC request body in one pass."""
+    return A2ARequest.validate_json(raw)
+
+
+def decode_batch(raw: bytes) -> List[Any]:
+    """
+    Parse a JSON-RPC batch array. Valid entries become request models and
+    invalid ones become InvalidBatchItem, in the original order.
+    """
+    items = from_json(raw)
+    if not isinstance(items, list):
+        raise ValueError("Batch body must be a JSON array")
+
+    decoded = []
+    for item in items:
+        try:
+            decoded.append(A2ARequest.validate_python(item))
+        except ValidationError as e:
+            request_id = item.get("id") if isinstance(item, dict) else None
+            decoded.append(InvalidBatchItem(request_id, str(e)))
+    return decoded
+
+
+@lru_cache(maxsize=None)
+def _adapter(model_type: type) -> TypeAdapter:
+    return TypeAdapter(model_type)
+
+
+def encode_response(response: BaseModel, exclude_none: bool = True) -> bytes:
+    """Serialize a response model directly to JSON bytes."""
+    return _adapter(type(response)).dump_json(response, exclude_none=exclude_none)
+
+
+def encode_batch(responses: Iterable[BaseModel]) -> bytes:
+    """Serialize batch responses into one JSON array (keeping `"id": null` on entries without an id)."""
+    return b"[" + b",".join(
+        encode_response(response, exclude_none=response.id is not None) for response in responses
+    ) + b"]"
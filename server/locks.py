@@ -0,0 +1,60 @@
+# =============================================================================
+# server/locks.py
+# =============================================================================
+# Purpose:
+# Striped asyncio locking for task managers.
+# - Updates to the same task serialize; unrelated tasks proceed in parallel
+# - A fixed number of stripes bounds memory regardless of task count
+# - Records how long callers wait so contention is visible
+# =============================================================================
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+
+class StripedLock:
+    """
+    Maps keys (task IDs) onto `stripes` asyncio.Locks. Two keys only contend
+    when they hash to the same stripe.
+
+    Args:
+        stripes (int): Number of underlying locks.
+    """
+
+    def __init__(self, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def acquire(self, key: str) -> AsyncIterator[None]:
+        lock = self._locks[hash(key) % len(self._locks)]
+
+        if lock.locked():
+            self.contended += 1
+        start = time.perf_counter()
+        await lock.acquire()
+        waited = time.perf_counter() - start
+
+        self.acquisitions += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "stripes": len(self._locks),
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "total_wait_seconds": self.total_wait,
+            "max_wait_seconds": self.max_wait,
+        }
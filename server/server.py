@@ -1,29 +1,77 @@
 # server/server.py
-import json
+import asyncio
 import logging
-from datetime import datetime
+import math
+import time
+from contextlib import asynccontextmanager, nullcontext
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, Response, StreamingResponse
 from models.agent import AgentCard
-from models.request import A2ARequest, SendTaskRequest
-from models.json_rpc import JSONRPCResponse, InternalError
+from models.request import SendTaskRequest, SendTaskStreamingRequest, GetTaskRequest, CancelTaskRequest
+from models.json_rpc import JSONRPCResponse, InternalError, InvalidRequestError, ServerBusyError
+from client.http_pool import close_shared_pool
+from server.codec import InvalidBatchItem, decode_batch, decode_request, encode_batch, encode_response, is_batch
+from server.admission import AdmissionController, AdmissionRejected
+from utilities.metrics import REGISTRY
 from uvicorn.config import Config
 from uvicorn.server import Server
 
 logger = logging.getLogger(__name__)
 
+# 📈 Metrics shared by every A2AServer in the process (scraped via /metrics)
+REQUESTS = REGISTRY.counter("a2a_requests_total", "JSON-RPC requests handled", ["agent", "method"])
+ERRORS = REGISTRY.counter("a2a_request_errors_total", "JSON-RPC requests answered with an error", ["agent", "method"])
+LATENCY = REGISTRY.histogram(
+    "a2a_request_latency_seconds", "Time to handle a JSON-RPC request (whole stream for tasks/sendSubscribe)",
+    ["agent", "method"]
+)
+IN_FLIGHT = REGISTRY.gauge("a2a_requests_in_flight", "JSON-RPC requests currently being handled", ["agent", "method"])
+ENCODE_LATENCY = REGISTRY.histogram(
+    "a2a_response_encode_seconds", "Time spent serializing JSON-RPC responses", ["agent", "method"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+)
+ADMISSION_REJECTIONS = REGISTRY.counter("a2a_admission_rejections_total", "Requests rejected as server busy", ["agent"])
+ADMISSION_QUEUE = REGISTRY.gauge("a2a_admission_queue_depth", "Requests waiting for an admission slot", ["agent"])
+TASK_STORE_SIZE = REGISTRY.gauge("a2a_task_store_size", "Tasks held by the task store", ["agent"])
+TASK_STORE_EVICTIONS = REGISTRY.counter("a2a_task_store_evictions_total", "Tasks evicted from the task store", ["agent", "reason"])
+TASK_LOCK_WAIT = REGISTRY.counter("a2a_task_lock_wait_seconds_total", "Time spent waiting for task locks", ["agent"])
+WORKER_POOL_QUEUED = REGISTRY.gauge("a2a_worker_pool_queued", "Background tasks waiting for a worker", ["agent"])
+WORKER_POOL_RUNNING = REGISTRY.gauge("a2a_worker_pool_running", "Background tasks currently running", ["agent"])
+
 class A2AServer:
-    def __init__(self, host="0.0.0.0", port=5000, agent_card: AgentCard = None, task_manager=None):
+    def __init__(self, host="0.0.0.0", port=5000, agent_card: AgentCard = None, task_manager=None,
+                 default_history_length: int | None = None, max_concurrency: int | None = None,
+                 max_queue: int = 0, queue_timeout: float | None = None, retry_after: float = 1.0,
+                 max_batch_size: int = 100):
+        """
+        Args:
+            default_history_length (int, optional): Cap on history messages returned by
+                tasks/send when the request does not set `historyLength` itself.
+            max_concurrency (int, optional): Max tasks/send + tasks/sendSubscribe calls
+                running at once (None = unbounded). Excess calls queue, then get rejected.
+            max_queue (int): Calls allowed to wait for a slot once max_concurrency is reached.
+            queue_timeout (float, optional): Reject calls that waited this long in the queue.
+            retry_after (float): Seconds a rejected caller is told to wait (Retry-After).
+            max_batch_size (int): Most entries accepted in one JSON-RPC batch array.
+        """
         self.host = host
         self.port = port
         self.agent_card = agent_card
         self.task_manager = task_manager
+        self.default_history_length = default_history_length
+        self.max_batch_size = max_batch_size
+        self._evictions_seen = {}  # reason -> store's eviction count at the last scrape
+        self._lock_wait_seen = 0.0  # locks.total_wait at the last scrape
+        self.admission = AdmissionController(
+            max_concurrency, max_queue=max_queue, queue_timeout=queue_timeout, retry_after=retry_after
+        ) if max_concurrency else None
 
-        self.app = Starlette()
+        self.app = Starlette(lifespan=self._lifespan)
         self.app.add_route("/tasks/send", self._handle_task_send, methods=["POST"])
         self.app.add_route("/.well-known/agent.json", self._get_agent_card, methods=["GET"])
+        self.app.add_route("/metrics", self._get_metrics, methods=["GET"])
 
     async def start(self):
         if not self.agent_card or not self.task_manager:
@@ -32,32 +80,250 @@ class A2AServer:
         server = Server(config=config)
         await server.serve()
 
+    @asynccontextmanager
+    async def _lifespan(self, app):
+        yield
+        # 🛑 Cancel background agent runs while the store can still record them as canceled
+        worker_pool = getattr(self.task_manager, "worker_pool", None)
+        if worker_pool is not None:
+            await worker_pool.shutdown()
+        # 🔌 Release pooled connections to downstream agents on shutdown
+        await close_shared_pool()
+        # 💾 Commit pending task writes and close the store
+        store = getattr(self.task_manager, "store", None)
+        if store is not None:
+            await store.close()
+
     def _get_agent_card(self, request: Request) -> JSONResponse:
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+        return JSONResponse(self.agent_card.model_dump(mode="json", exclude_none=True))
+
+    async def _get_metrics(self, request: Request) -> Response:
+        await self._collect_gauges()
+        return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+    async def _collect_gauges(self):
+        """Snapshot point-in-time values (store size, queues) and advance counters kept as running totals."""
+        agent = self.agent_name
+        store = getattr(self.task_manager, "store", None)
+        if store is not None:
+            TASK_STORE_SIZE.set(await store.size(), agent=agent)
+            stats = store.stats()
+            for reason in ("capacity", "ttl"):
+                if f"evicted_{reason}" in stats:
+                    # The store keeps running totals; the counter advances by what is new
+                    total = stats[f"evicted_{reason}"]
+                    seen = self._evictions_seen.get(reason, 0)
+                    if total > seen:
+                        TASK_STORE_EVICTIONS.inc(total - seen, agent=agent, reason=reason)
+                    self._evictions_seen[reason] = total
+
+        locks = getattr(self.task_manager, "locks", None)
+        if locks is not None:
+            total = locks.total_wait
+            if total > self._lock_wait_seen:
+                TASK_LOCK_WAIT.inc(total - self._lock_wait_seen, agent=agent)
+            self._lock_wait_seen = total
+
+        worker_pool = getattr(self.task_manager, "worker_pool", None)
+        if worker_pool is not None:
+            WORKER_POOL_QUEUED.set(worker_pool.queued, agent=agent)
+            WORKER_POOL_RUNNING.set(worker_pool.running, agent=agent)
+
+        if self.admission is not None:
+            ADMISSION_QUEUE.set(self.admission.queued, agent=agent)
+
+    @property
+    def agent_name(self) -> str:
+        return self.agent_card.name if self.agent_card else "unknown"
+
+    def _start_request(self, method: str):
+        """Count a request as in flight; returns an idempotent `finish(failed)` callback."""
+        labels = {"agent": self.agent_name, "method": method}
+        REQUESTS.inc(**labels)
+        IN_FLIGHT.inc(**labels)
+        start = time.perf_counter()
+        finished = False
+
+        def finish(failed: bool = False):
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            IN_FLIGHT.dec(**labels)
+            LATENCY.observe(time.perf_counter() - start, **labels)
+            if failed:
+                ERRORS.inc(**labels)
+
+        return finish
 
     async def _handle_task_send(self, request: Request):
+        json_rpc = None
+        finish = None
+        failed = True
         try:
-            body = await request.json()
-            print("\n📨 Incoming JSON-RPC Request:", json.dumps(body, indent=2))
+            body = await request.body()
+            logger.debug("📨 Incoming JSON-RPC Request: %s", body)
+
+            if is_batch(body):
+                return await self._handle_batch(body)
+
+            # Parse + validate straight from bytes in a single pass
+            json_rpc = decode_request(body)
+            finish = self._start_request(json_rpc.method)
 
-            json_rpc = A2ARequest.validate_python(body)
+            if isinstance(json_rpc, SendTaskStreamingRequest):
+                # The slot is held until the stream ends, not just until headers are sent
+                release = await self._acquire_stream_slot()
+                events = self.task_manager.on_send_task_subscribe(json_rpc)
+                stream_finish, finish = finish, None  # The stream reports its own outcome
 
-            if isinstance(json_rpc, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc)
-            else:
-                raise ValueError(f"Unsupported A2A method: {type(json_rpc)}")
+                def on_close(stream_failed: bool):
+                    if release:
+                        release()
+                    stream_finish(stream_failed)
 
-            return self._create_response(result)
+                return self._create_sse_response(json_rpc.id, events, on_close=on_close)
+
+            result = await self._dispatch(json_rpc)
+            response = self._create_response(result, json_rpc.method)
+            failed = result.error is not None
+            return response
+
+        except AdmissionRejected as e:
+            logger.warning(f"🚦 Rejected {type(json_rpc).__name__}: {e}")
+            ADMISSION_REJECTIONS.inc(agent=self.agent_name)
+            return Response(
+                encode_response(JSONRPCResponse(
+                    id=json_rpc.id if json_rpc else None,
+                    error=ServerBusyError(data={"retryAfter": e.retry_after})
+                )),
+                status_code=503,
+                headers={"Retry-After": str(math.ceil(e.retry_after))},
+                media_type="application/json"
+            )
 
         except Exception as e:
             logger.error(f"❌ Exception in server: {e}")
-            return JSONResponse(
-                JSONRPCResponse(id=None, error=InternalError(message=str(e))).model_dump(),
-                status_code=400
+            if finish is None and json_rpc is None:
+                finish = self._start_request("invalid")
+            return Response(
+                encode_response(JSONRPCResponse(id=None, error=InternalError(message=str(e))), exclude_none=False),
+                status_code=400,
+                media_type="application/json"
+            )
+
+        finally:
+            if finish:
+                finish(failed)
+
+    async def _dispatch(self, json_rpc) -> JSONRPCResponse:
+        """Run one non-streaming request against the task manager."""
+        if isinstance(json_rpc, SendTaskRequest):
+            if json_rpc.params.historyLength is None:
+                json_rpc.params.historyLength = self.default_history_length
+            async with self.admission.admit() if self.admission else nullcontext():
+                return await self.task_manager.on_send_task(json_rpc)
+        elif isinstance(json_rpc, GetTaskRequest):
+            return await self.task_manager.on_get_task(json_rpc)
+        elif isinstance(json_rpc, CancelTaskRequest):
+            return await self.task_manager.on_cancel_task(json_rpc)
+        raise ValueError(f"Unsupported A2A method: {type(json_rpc)}")
+
+    async def _handle_batch(self, body: bytes) -> Response:
+        """
+        JSON-RPC 2.0 batch: entries run concurrently and the response array
+        keeps request order. Each entry succeeds or fails on its own.
+        """
+        items = decode_batch(body)
+        if not items or len(items) > self.max_batch_size:
+            message = f"Batch must contain between 1 and {self.max_batch_size} requests"
+            return Response(
+                encode_response(JSONRPCResponse(id=None, error=InvalidRequestError(message=message)), exclude_none=False),
+                status_code=400,
+                media_type="application/json"
             )
 
-    def _create_response(self, result):
+        responses = await asyncio.gather(*(self._run_batch_item(item) for item in items))
+        with ENCODE_LATENCY.time(agent=self.agent_name, method="batch"):
+            content = encode_batch(responses)
+        return Response(content, media_type="application/json")
+
+    async def _run_batch_item(self, item) -> JSONRPCResponse:
+        if isinstance(item, InvalidBatchItem):
+            self._start_request("invalid")(failed=True)
+            return JSONRPCResponse(id=item.request_id, error=InvalidRequestError(message=str(item)))
+
+        finish = self._start_request(item.method)
+        failed = True
+        try:
+            if isinstance(item, SendTaskStreamingRequest):
+                return JSONRPCResponse(
+                    id=item.id, error=InvalidRequestError(message="tasks/sendSubscribe cannot be batched")
+                )
+            result = await self._dispatch(item)
+            failed = result.error is not None
+            return result
+
+        except AdmissionRejected as e:
+            ADMISSION_REJECTIONS.inc(agent=self.agent_name)
+            return JSONRPCResponse(id=item.id, error=ServerBusyError(data={"retryAfter": e.retry_after}))
+
+        except Exception as e:
+            logger.error(f"❌ Exception in batch entry {item.id}: {e}")
+            return JSONRPCResponse(id=item.id, error=InternalError(message=str(e)))
+
+        finally:
+            finish(failed)
+
+    def _create_response(self, result, method: str):
         if isinstance(result, JSONRPCResponse):
-            return JSONResponse(content=jsonable_encoder(result.model_dump(exclude_none=True)))
+            # Model -> JSON bytes in one pass (no model_dump/jsonable_encoder/json.dumps chain)
+            with ENCODE_LATENCY.time(agent=self.agent_name, method=method):
+                content = encode_response(result)
+            return Response(content, media_type="application/json")
         else:
             raise ValueError("Invalid response type")
+
+    async def _acquire_stream_slot(self):
+        """Take an admission slot for a stream; returns the release callback (or None)."""
+        if self.admission is None:
+            return None
+        await self.admission.acquire()
+        return self.admission.release
+
+    def _create_sse_response(self, request_id, events, on_close=None):
+        """
+        Wrap an async iterator of SendTaskStreamingResponse objects into a
+        text/event-stream response, one `data:` frame per event.
+
+        `on_close(failed)` runs exactly once: when the stream ends, or as a
+        background task if the client disconnects before the first event.
+        """
+        closed = False
+
+        def close(failed: bool = False):
+            nonlocal closed
+            if on_close and not closed:
+                closed = True
+                on_close(failed)
+
+        async def event_stream():
+            failed = False
+            try:
+                async for event in events:
+                    failed = failed or event.error is not None
+                    yield b"data: " + encode_response(event) + b"\n\n"
+            except Exception as e:
+                failed = True
+                logger.error(f"❌ Exception while streaming task: {e}")
+                error = JSONRPCResponse(id=request_id, error=InternalError(message=str(e)))
+                yield b"data: " + encode_response(error) + b"\n\n"
+            finally:
+                close(failed)
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            background=BackgroundTask(close)
+        )
@@ -0,0 +1,279 @@
+# =============================================================================
+# server/sqlite_task_store.py
+# =============================================================================
+# Purpose:
+# Durable TaskStore backed by a local SQLite database (WAL mode).
+# - Tasks, their TaskStatus and Message history survive agent restarts
+# - Writes from concurrent on_send_task calls are group-committed: puts
+#   arriving within `batch_interval` share one transaction
+# - History is stored one row per message and only new messages are written,
+#   so a put costs O(new messages) rather than O(history)
+# - Indexed by task ID and sessionId
+# - Tasks left submitted/working by a previous process are marked failed on
+#   open, since nothing will ever finish them
+# =============================================================================
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from models.task import Task, TaskState, TaskStatus, Message
+from server.task_store import TaskStore, TERMINAL_STATES
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id          TEXT PRIMARY KEY,
+    session_id  TEXT,
+    state       TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    history_len INTEGER NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_session ON tasks (session_id);
+CREATE TABLE IF NOT EXISTS messages (
+    task_id TEXT NOT NULL,
+    seq     INTEGER NOT NULL,
+    role    TEXT NOT NULL,
+    parts   TEXT NOT NULL,
+    PRIMARY KEY (task_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    Persists tasks to SQLite. All database work runs on one background thread,
+    so the event loop never blocks on disk I/O.
+
+    Args:
+        path (str): Database file (created if missing).
+        batch_interval (float): Seconds to wait for more writes before committing.
+        max_batch (int): Commit immediately once this many tasks are pending.
+    """
+
+    def __init__(self, path: str = "tasks.db", batch_interval: float = 0.005, max_batch: int = 256):
+        self.path = path
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-task-store")
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.recovered = self._fail_interrupted()
+
+        self._pending: Dict[str, Task] = {}
+        self._inflight: Dict[str, Task] = {}  # Batch being committed; still readable until it is on disk
+        self._batch_done: asyncio.Future | None = None
+        self._batch_full: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        # Messages already on disk per task (bounded; misses fall back to a query)
+        self._persisted_len: "OrderedDict[str, int]" = OrderedDict()
+        self._persisted_len_cap = 10_000
+
+        self.commits = 0
+        self.tasks_written = 0
+        self.messages_written = 0
+
+    # -------------------------------------------------------------------------
+    # TaskStore API
+    # -------------------------------------------------------------------------
+    async def get(self, task_id: str) -> Task | None:
+        pending = self._pending.get(task_id) or self._inflight.get(task_id)
+        if pending is not None:
+            return pending  # Read-your-writes before the batch commits
+
+        task = await self._run(self._load_task, task_id)
+        if task is not None:
+            self._remember_len(task.id, len(task.history))
+        return task
+
+    async def put(self, task: Task) -> None:
+        """Queue `task` for the next group commit and wait until it is durable."""
+        if self._batch_done is None:
+            loop = asyncio.get_running_loop()
+            self._batch_done = loop.create_future()
+            self._batch_full = asyncio.Event()
+            asyncio.create_task(self._flush_batch(self._batch_done, self._batch_full))
+
+        self._pending[task.id] = task
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+
+        await asyncio.shield(self._batch_done)
+
+    async def delete(self, task_id: str) -> None:
+        self._pending.pop(task_id, None)
+        self._inflight.pop(task_id, None)
+        self._persisted_len.pop(task_id, None)
+        await self._run(self._delete_task, task_id)
+
+    async def size(self) -> int:
+        return await self._run(lambda: self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0])
+
+    async def list_session_task_ids(self, session_id: str) -> List[str]:
+        """IDs of all tasks belonging to a session, oldest first."""
+        rows = await self._run(
+            lambda: self._conn.execute(
+                "SELECT id FROM tasks WHERE session_id = ? ORDER BY updated_at", (session_id,)
+            ).fetchall()
+        )
+        return [row[0] for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending) + len(self._inflight),
+            "commits": self.commits,
+            "tasks_written": self.tasks_written,
+            "messages_written": self.messages_written,
+            "recovered": self.recovered,
+        }
+
+    async def close(self):
+        """Commit anything pending and close the database."""
+        if self._batch_done is not None:
+            self._batch_full.set()
+            await asyncio.shield(self._batch_done)
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
+
+    # -------------------------------------------------------------------------
+    # Group commit
+    # -------------------------------------------------------------------------
+    async def _flush_batch(self, done: asyncio.Future, full: asyncio.Event):
+        try:
+            await asyncio.wait_for(full.wait(), self.batch_interval)
+        except asyncio.TimeoutError:
+            pass
+
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            # Puts arriving from here on start the next batch
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+            self._batch_done = self._batch_full = None
+            try:
+                await self._write_batch(batch)
+                done.set_result(None)
+            except Exception as e:
+                logger.error(f"[SQLiteTaskStore] Commit of {len(batch)} tasks failed: {e}")
+                done.set_exception(e)
+            finally:
+                self._inflight = {}
+
+    async def _write_batch(self, batch: Dict[str, Task]):
+        unknown = [task_id for task_id in batch if task_id not in self._persisted_len]
+        if unknown:
+            for task_id, history_len in (await self._run(self._load_history_lens, unknown)).items():
+                self._remember_len(task_id, history_len)
+
+        # Serialize on the event loop thread, where the Task objects are mutated
+        now = time.time()
+        task_rows, message_rows, truncated, written_lens = [], [], [], {}
+        for task in batch.values():
+            written_lens[task.id] = len(task.history)
+            start = self._persisted_len.get(task.id, 0)
+            if len(task.history) < start:
+                truncated.append((task.id, len(task.history)))
+                start = len(task.history)
+            task_rows.append((
+                task.id, task.sessionId, task.status.state,
+                task.status.model_dump_json(), len(task.history), now,
+            ))
+            message_rows.extend(
+                (task.id, seq, message.role, json.dumps([part.model_dump() for part in message.parts]))
+                for seq, message in enumerate(task.history[start:], start)
+            )
+
+        await self._run(self._commit, task_rows, message_rows, truncated)
+
+        for task_id, history_len in written_lens.items():
+            self._remember_len(task_id, history_len)
+        self.commits += 1
+        self.tasks_written += len(task_rows)
+        self.messages_written += len(message_rows)
+
+    # -------------------------------------------------------------------------
+    # Blocking helpers (run on the store's thread)
+    # -------------------------------------------------------------------------
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _commit(self, task_rows, message_rows, truncated):
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "DELETE FROM messages WHERE task_id = ? AND seq >= ?", truncated
+            )
+            self._conn.executemany(
+                "INSERT INTO tasks (id, session_id, state, status, history_len, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET session_id = excluded.session_id, state = excluded.state, "
+                "status = excluded.status, history_len = excluded.history_len, updated_at = excluded.updated_at",
+                task_rows,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO messages (task_id, seq, role, parts) VALUES (?, ?, ?, ?)",
+                message_rows,
+            )
+
+    def _fail_interrupted(self) -> int:
+        """Mark tasks a previous process left in flight as failed; returns how many."""
+        terminal = [state.value for state in TERMINAL_STATES]
+        placeholders = ",".join("?" * len(terminal))
+        status = TaskStatus(state=TaskState.FAILED).model_dump_json()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            count = self._conn.execute(
+                f"UPDATE tasks SET state = ?, status = ?, updated_at = ? WHERE state NOT IN ({placeholders})",
+                (TaskState.FAILED.value, status, time.time(), *terminal),
+            ).rowcount
+        if count:
+            logger.warning(f"[SQLiteTaskStore] Marked {count} tasks interrupted by a restart as failed")
+        return count
+
+    def _load_task(self, task_id: str) -> Task | None:
+        row = self._conn.execute(
+            "SELECT session_id, status FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        messages = self._conn.execute(
+            "SELECT role, parts FROM messages WHERE task_id = ? ORDER BY seq", (task_id,)
+        ).fetchall()
+        return Task(
+            id=task_id,
+            sessionId=row[0],
+            status=TaskStatus.model_validate_json(row[1]),
+            history=[Message(role=role, parts=json.loads(parts)) for role, parts in messages],
+        )
+
+    def _load_history_lens(self, task_ids: List[str]) -> Dict[str, int]:
+        placeholders = ",".join("?" * len(task_ids))
+        rows = self._conn.execute(
+            f"SELECT id, history_len FROM tasks WHERE id IN ({placeholders})", task_ids
+        ).fetchall()
+        return dict(rows)
+
+    def _delete_task(self, task_id: str):
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM messages WHERE task_id = ?", (task_id,))
+            self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def _remember_len(self, task_id: str, history_len: int):
+        self._persisted_len[task_id] = history_len
+        self._persisted_len.move_to_end(task_id)
+        while len(self._persisted_len) > self._persisted_len_cap:
+            self._persisted_len.popitem(last=False)
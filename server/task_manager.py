@@ -3,14 +3,37 @@
 # =============================================================================
 
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import AsyncIterable, AsyncIterator
 import asyncio
+import logging
 
-from models.request import SendTaskRequest, SendTaskResponse, GetTaskRequest, GetTaskResponse
-from models.task import Task, TaskSendParams, TaskQueryParams, TaskStatus, TaskState, Message
+from models.json_rpc import InternalError, TaskNotFoundError, TaskNotCancelableError
+from models.request import (
+    SendTaskRequest, SendTaskResponse, GetTaskRequest, GetTaskResponse,
+    SendTaskStreamingRequest, SendTaskStreamingResponse,
+    CancelTaskRequest, CancelTaskResponse,
+)
+from models.task import (
+    Task, TaskSendParams, TaskQueryParams, TaskStatus, TaskState, Message,
+    TaskStatusUpdateEvent, AgentUpdate,
+)
+from server.locks import StripedLock
+from server.task_store import TaskStore, InMemoryTaskStore, TERMINAL_STATES
+from server.worker_pool import WorkerPool, WorkerPoolFullError
+from utilities.metrics import REGISTRY
 
 # Import your CrewAI/LLM logic here — e.g., build_agent_response() should handle agent output
-from agent.core import build_agent_response  # 👈 Replace with your actual CrewAI agent runner
+try:
+    from agent.core import build_agent_response  # 👈 Replace with your actual CrewAI agent runner
+except ImportError:
+    # Keep the shared base classes below importable by the other agents
+    build_agent_response = None
+
+logger = logging.getLogger(__name__)
+
+AGENT_LATENCY = REGISTRY.histogram(
+    "a2a_agent_invoke_latency_seconds", "Time spent inside the agent (LLM + tools) per task", ["manager"]
+)
 
 
 # -----------------------------------------------------------------------------
@@ -26,68 +49,262 @@ class TaskManager(ABC):
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         pass
 
+    @abstractmethod
+    async def on_cancel_task(self, request: CancelTaskRequest) -> CancelTaskResponse:
+        pass
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        """
+        Default streaming implementation: emit a WORKING update right away,
+        run the regular on_send_task, then emit the final state with the
+        agent's reply. Managers whose agent can produce partial output
+        should override this.
+        """
+        params = request.params
+        yield SendTaskStreamingResponse(
+            id=request.id,
+            result=TaskStatusUpdateEvent(id=params.id, status=TaskStatus(state=TaskState.WORKING))
+        )
+
+        response = await self.on_send_task(SendTaskRequest(id=request.id, params=params))
+        if response.error:
+            yield SendTaskStreamingResponse(id=request.id, error=response.error)
+            return
+
+        task = response.result
+        reply = task.history[-1] if task.history else None
+        yield SendTaskStreamingResponse(
+            id=request.id,
+            result=TaskStatusUpdateEvent(
+                id=task.id,
+                status=TaskStatus(state=task.status.state, message=reply),
+                final=True
+            )
+        )
+
 
 # -----------------------------------------------------------------------------
-# Healthcare Task Manager (In-Memory + LLM Orchestration)
+# In-Memory Task Manager (shared bookkeeping for all agents)
 # -----------------------------------------------------------------------------
 
-class HealthcareTaskManager(TaskManager):
+class InMemoryTaskManager(TaskManager):
     """
-    This Task Manager uses CrewAI to process tasks in memory and respond based on
-    the healthcare agent's logic (SymptomChecker, Appointment, or HealthRecords).
+    Handles the A2A plumbing shared by every agent: storing user/agent
+    messages, tasks/get, tasks/cancel and streaming. Subclasses only
+    implement `invoke_agent`.
+
+    Tasks live in a TaskStore — by default a bounded InMemoryTaskStore that
+    evicts least-recently-used and expired finished tasks.
+
+    When a WorkerPool is supplied, `tasks/send` returns immediately with the
+    task in WORKING state and the agent runs on the pool; clients then poll
+    with `tasks/get` or abort with `tasks/cancel`.
+
+    Updates are serialized per task through a StripedLock, so a slow update
+    of one session never blocks another; see `locks.stats()` for wait times.
     """
 
-    def __init__(self):
-        self.tasks: Dict[str, Task] = {}
-        self.lock = asyncio.Lock()
+    def __init__(self, worker_pool: WorkerPool | None = None, store: TaskStore | None = None,
+                 lock_stripes: int = 64):
+        self.store = store or InMemoryTaskStore()
+        self.locks = StripedLock(lock_stripes)
+        self.worker_pool = worker_pool
+
+    @abstractmethod
+    async def invoke_agent(self, params: TaskSendParams) -> str:
+        """Run the agent on the task's latest user message and return its reply text."""
+        pass
+
+    async def stream_agent(self, params: TaskSendParams) -> AsyncIterator[AgentUpdate]:
+        """
+        Like invoke_agent, but yields progress updates before the reply, which
+        comes last with `final=True`. Override for agents that can report
+        progress; the default just yields the invoke_agent reply.
+        """
+        yield AgentUpdate(text=await self.invoke_agent(params), final=True)
+
+    @staticmethod
+    def _task_view(task: Task, history_length: int | None) -> Task:
+        """
+        The task as returned on the wire, with only the last `history_length`
+        messages. Costs O(history_length): the stored task is not copied.
+        """
+        if history_length is None:
+            return task
+        history = task.history[-history_length:] if history_length > 0 else []
+        return task.model_copy(update={"history": history})
 
     async def upsert_task(self, params: TaskSendParams) -> Task:
-        async with self.lock:
-            task = self.tasks.get(params.id)
+        async with self.locks.acquire(params.id):
+            task = await self.store.get(params.id)
 
             if task is None:
                 task = Task(
                     id=params.id,
+                    sessionId=params.sessionId,
                     status=TaskStatus(state=TaskState.SUBMITTED),
                     history=[params.message]
                 )
-                self.tasks[params.id] = task
             else:
                 task.history.append(params.message)
 
+            await self.store.put(task)
             return task
 
+    async def _update_task(self, task_id: str, state: TaskState, message: Message | None = None,
+                           unless_canceled: bool = False) -> Task | None:
+        """
+        Re-read the task from the store, apply the new state (and message) and
+        write it back. Returns None if the task is gone (evicted or deleted).
+        """
+        async with self.locks.acquire(task_id):
+            task = await self.store.get(task_id)
+            if task is None or (unless_canceled and task.status.state == TaskState.CANCELED):
+                return task
+
+            if message is not None:
+                task.history.append(message)
+            task.status = TaskStatus(state=state)
+            await self.store.put(task)
+            return task
+
+    async def _run_task(self, params: TaskSendParams) -> Task | None:
+        """Invoke the agent and record its reply (or the failure) on the task."""
+        await self._update_task(params.id, TaskState.WORKING)
+
+        try:
+            with AGENT_LATENCY.time(manager=type(self).__name__):
+                agent_reply = await self.invoke_agent(params)
+        except asyncio.CancelledError:
+            await self._update_task(params.id, TaskState.CANCELED)
+            raise
+        except Exception:
+            await self._update_task(params.id, TaskState.FAILED)
+            raise
+
+        agent_msg = Message(role="agent", parts=[{"type": "text", "text": agent_reply}])
+        return await self._update_task(params.id, TaskState.COMPLETED, agent_msg, unless_canceled=True)
+
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
         params = request.params
-        user_message = params.message.parts[0].text
+        task = await self.upsert_task(params)
+
+        if self.worker_pool is None:
+            task = await self._run_task(params) or task
+            return SendTaskResponse(id=request.id, result=self._task_view(task, params.historyLength))
+
+        # ⏳ Background mode: hand the agent run to the pool and answer right away
+        task = await self._update_task(params.id, TaskState.WORKING) or task
+        try:
+            self.worker_pool.submit(params.id, lambda: self._run_task(params))
+        except WorkerPoolFullError as e:
+            await self._update_task(params.id, TaskState.FAILED)
+            return SendTaskResponse(id=request.id, error=InternalError(message=str(e)))
+
+        return SendTaskResponse(id=request.id, result=self._task_view(task, params.historyLength))
 
-        # ⬇️ Store user message + create/update task
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        """
+        Streams task progress: a WORKING update as soon as the task is stored,
+        a WORKING update per stream_agent progress item (tool calls, partial
+        text), then the final state carrying the agent's reply. The stream
+        itself is the asynchronous path, so the agent always runs inline here.
+        """
+        params = request.params
         task = await self.upsert_task(params)
+        await self._update_task(params.id, TaskState.WORKING)
+        yield SendTaskStreamingResponse(
+            id=request.id,
+            result=TaskStatusUpdateEvent(id=task.id, status=TaskStatus(state=TaskState.WORKING))
+        )
 
-        # 🤖 Generate reply using CrewAI agent logic (customize per agent)
+        agent_reply = ""
         try:
-            agent_reply = await build_agent_response(user_message)  # CrewAI output (text)
+            with AGENT_LATENCY.time(manager=type(self).__name__):
+                async for update in self.stream_agent(params):
+                    if update.final:
+                        agent_reply = update.text
+                        continue
+                    yield SendTaskStreamingResponse(
+                        id=request.id,
+                        result=TaskStatusUpdateEvent(
+                            id=task.id,
+                            status=TaskStatus(
+                                state=TaskState.WORKING,
+                                message=Message(role="agent", parts=[{"type": "text", "text": update.text}])
+                            ),
+                            metadata={"kind": update.kind, **(update.metadata or {})}
+                        )
+                    )
+        except (asyncio.CancelledError, GeneratorExit):
+            await self._update_task(params.id, TaskState.CANCELED)  # Client went away mid-stream
+            raise
         except Exception as e:
-            agent_reply = f"Sorry, an internal error occurred: {e}"
+            await self._update_task(params.id, TaskState.FAILED)
+            yield SendTaskStreamingResponse(id=request.id, error=InternalError(message=str(e)))
+            return
 
-        # 🧾 Record agent response
         agent_msg = Message(role="agent", parts=[{"type": "text", "text": agent_reply}])
-        async with self.lock:
-            task.history.append(agent_msg)
-            task.status.state = TaskState.COMPLETED
+        task = await self._update_task(params.id, TaskState.COMPLETED, agent_msg, unless_canceled=True) or task
 
-        return SendTaskResponse(id=request.id, result=task)
+        reply = task.history[-1] if task.history else None
+        yield SendTaskStreamingResponse(
+            id=request.id,
+            result=TaskStatusUpdateEvent(
+                id=task.id,
+                status=TaskStatus(state=task.status.state, message=reply),
+                final=True
+            )
+        )
 
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
-        async with self.lock:
-            query: TaskQueryParams = request.params
-            task = self.tasks.get(query.id)
+        # Reads take no lock: a task is only mutated while its writer holds the
+        # per-task lock, and the view below copies just the history it returns.
+        query: TaskQueryParams = request.params
+        task = await self.store.get(query.id)
+
+        if not task:
+            return GetTaskResponse(id=request.id, error=TaskNotFoundError())
+
+        return GetTaskResponse(id=request.id, result=self._task_view(task, query.historyLength))
+
+    async def on_cancel_task(self, request: CancelTaskRequest) -> CancelTaskResponse:
+        async with self.locks.acquire(request.params.id):
+            task = await self.store.get(request.params.id)
 
             if not task:
-                return GetTaskResponse(id=request.id, error={"message": "Task not found"})
+                return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
+
+            if task.status.state in TERMINAL_STATES or self.worker_pool is None \
+                    or not self.worker_pool.cancel(task.id):
+                return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+
+            task.status = TaskStatus(state=TaskState.CANCELED)
+            await self.store.put(task)
+            return CancelTaskResponse(id=request.id, result=task)
 
-            task_copy = task.model_copy()
-            if query.historyLength is not None:
-                task_copy.history = task_copy.history[-query.historyLength:]
 
-            return GetTaskResponse(id=request.id, result=task_copy)
+# -----------------------------------------------------------------------------
+# Healthcare Task Manager (In-Memory + LLM Orchestration)
+# -----------------------------------------------------------------------------
+
+class HealthcareTaskManager(InMemoryTaskManager):
+    """
+    This Task Manager uses CrewAI to process tasks in memory and respond based on
+    the healthcare agent's logic (SymptomChecker, Appointment, or HealthRecords).
+    """
+
+    async def invoke_agent(self, params: TaskSendParams) -> str:
+        user_message = params.message.parts[0].text
+
+        # 🤖 Generate reply using CrewAI agent logic (customize per agent)
+        try:
+            if build_agent_response is None:
+                raise RuntimeError("agent.core.build_agent_response is not available")
+            return await build_agent_response(user_message)  # CrewAI output (text)
+        except Exception as e:
+            return f"Sorry, an internal error occurred: {e}"
@@ -0,0 +1,150 @@
+# =============================================================================
+# server/task_store.py
+# =============================================================================
+# Purpose:
+# Pluggable storage for A2A tasks used by the task managers.
+# - TaskStore: the async interface every backend implements
+# - InMemoryTaskStore: bounded store that evicts finished (completed/canceled/
+#   failed) tasks, oldest first, when full or once they are older than a TTL,
+#   so long-running agents keep a flat memory footprint without dropping
+#   tasks that are still in flight
+# =============================================================================
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict
+
+from models.task import Task, TaskState
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = {TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED}
+
+
+# -----------------------------------------------------------------------------
+# Abstract Base Class
+# -----------------------------------------------------------------------------
+
+class TaskStore(ABC):
+    """
+    Async key-value store for tasks, keyed by task ID.
+
+    Callers must `put` a task again after mutating it; backends other than
+    the in-memory one do not observe in-place changes.
+    """
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Task | None:
+        pass
+
+    @abstractmethod
+    async def put(self, task: Task) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, task_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def size(self) -> int:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend-specific counters (size, evictions, ...)."""
+        return {}
+
+    async def close(self):
+        """Flush and release the backend on shutdown (nothing to do by default)."""
+        pass
+
+
+# -----------------------------------------------------------------------------
+# Bounded In-Memory Store (LRU + TTL for finished tasks)
+# -----------------------------------------------------------------------------
+
+class InMemoryTaskStore(TaskStore):
+    """
+    Keeps at most `max_tasks` tasks, evicting the task that finished first when
+    full, and drops tasks that have been in a terminal state for longer than
+    `terminal_ttl` seconds. Submitted/working tasks are never evicted: if every
+    stored task is in flight the store grows past `max_tasks` until some finish.
+
+    Args:
+        max_tasks (int): Upper bound on stored tasks (None = unbounded).
+        terminal_ttl (float): Seconds a finished task is kept (None = forever).
+    """
+
+    def __init__(self, max_tasks: int | None = 10_000, terminal_ttl: float | None = 3600.0):
+        self.max_tasks = max_tasks
+        self.terminal_ttl = terminal_ttl
+        self._tasks: "OrderedDict[str, Task]" = OrderedDict()       # LRU order
+        self._finished_at: "OrderedDict[str, float]" = OrderedDict()  # Finish order
+        self.evicted_capacity = 0
+        self.evicted_ttl = 0
+        self._overflowing = False
+
+    async def get(self, task_id: str) -> Task | None:
+        self._expire(time.monotonic())
+        task = self._tasks.get(task_id)
+        if task is not None:
+            self._tasks.move_to_end(task_id)
+        return task
+
+    async def put(self, task: Task) -> None:
+        now = time.monotonic()
+        self._tasks[task.id] = task
+        self._tasks.move_to_end(task.id)
+
+        if task.status.state in TERMINAL_STATES:
+            if task.id not in self._finished_at:
+                self._finished_at[task.id] = now
+        else:
+            self._finished_at.pop(task.id, None)  # Task was resumed with a new message
+
+        self._expire(now)
+        if self.max_tasks is None:
+            return
+        while len(self._tasks) > self.max_tasks and self._finished_at:
+            task_id, _ = self._finished_at.popitem(last=False)
+            self._tasks.pop(task_id, None)
+            self.evicted_capacity += 1
+
+        overflowing = len(self._tasks) > self.max_tasks
+        if overflowing and not self._overflowing:
+            logger.warning(
+                f"[TaskStore] All {len(self._tasks)} stored tasks are in flight; "
+                f"keeping them beyond max_tasks={self.max_tasks}"
+            )
+        self._overflowing = overflowing
+
+    async def delete(self, task_id: str) -> None:
+        self._tasks.pop(task_id, None)
+        self._finished_at.pop(task_id, None)
+
+    async def size(self) -> int:
+        self._expire(time.monotonic())
+        return len(self._tasks)
+
+    def stats(self) -> Dict[str, Any]:
+        self._expire(time.monotonic())
+        return {
+            "size": len(self._tasks),
+            "max_tasks": self.max_tasks,
+            "in_flight": len(self._tasks) - len(self._finished_at),
+            "evicted_capacity": self.evicted_capacity,
+            "evicted_ttl": self.evicted_ttl,
+        }
+
+    def _expire(self, now: float):
+        """Drop finished tasks past their TTL; `_finished_at` is oldest-first."""
+        if self.terminal_ttl is None:
+            return
+        while self._finished_at:
+            task_id, finished = next(iter(self._finished_at.items()))
+            if now - finished < self.terminal_ttl:
+                break
+            self._finished_at.popitem(last=False)
+            self._tasks.pop(task_id, None)
+            self.evicted_ttl += 1
@@ -0,0 +1,115 @@
+# =============================================================================
+# server/worker_pool.py
+# =============================================================================
+# Purpose:
+# A bounded pool of asyncio workers used to run agent work (LLM + tools) in the
+# background, so `tasks/send` can return immediately in WORKING state and
+# clients poll with `tasks/get` or abort with `tasks/cancel`.
+# =============================================================================
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Set
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPoolFullError(Exception):
+    """Raised when the pool's job queue is at capacity."""
+    pass
+
+
+class WorkerPool:
+    """
+    Runs submitted jobs on at most `max_workers` concurrent workers.
+
+    Jobs are keyed (by task ID) so they can be cancelled while queued or
+    while running. At most `max_queue` jobs may wait for a free worker;
+    further submissions raise WorkerPoolFullError.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 100):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._pending: Set[str] = set()
+        self._running: Dict[str, asyncio.Task] = {}
+
+    @property
+    def queued(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def _ensure_started(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    def submit(self, key: str, job: Callable[[], Awaitable]) -> None:
+        """
+        Queue `job` (a zero-argument coroutine function) under `key`.
+
+        Raises:
+            WorkerPoolFullError: If `max_queue` jobs are already waiting.
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((key, job))
+        except asyncio.QueueFull:
+            raise WorkerPoolFullError(f"Worker pool queue is full ({self.max_queue} jobs waiting)")
+        self._pending.add(key)
+
+    def cancel(self, key: str) -> bool:
+        """
+        Cancel a queued or running job. Returns False if no such job is known.
+        """
+        if key in self._pending:
+            self._pending.discard(key)  # Worker skips it when dequeued
+            return True
+
+        job = self._running.get(key)
+        if job is not None and not job.done():
+            job.cancel()
+            return True
+
+        return False
+
+    async def shutdown(self):
+        """Cancel all workers and any jobs they are running."""
+        for job in self._running.values():
+            job.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._pending.clear()
+
+    async def _worker(self):
+        while True:
+            key, job = await self._queue.get()
+            try:
+                if key not in self._pending:
+                    continue  # Cancelled while queued
+                self._pending.discard(key)
+
+                running = asyncio.create_task(job())
+                self._running[key] = running
+                try:
+                    await running
+                except asyncio.CancelledError:
+                    if asyncio.current_task().cancelling():
+                        raise  # The worker itself is shutting down
+                    logger.info(f"[WorkerPool] Job {key} cancelled")
+                except Exception as e:
+                    logger.error(f"[WorkerPool] Job {key} failed: {e}")
+                finally:
+                    self._running.pop(key, None)
+            finally:
+                self._queue.task_done()
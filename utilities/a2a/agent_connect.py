@@ -4,16 +4,33 @@
 # 🎯 Purpose:
 # Provides an async wrapper (`AgentConnector`) to delegate healthcare tasks
 # to remote A2A agents (e.g., SymptomCheckerAgent, AppointmentAgent, etc.)
+# Agents with several replicas are load-balanced per request
+# (see utilities/a2a/load_balancer.py)
 # =============================================================================
 
 import uuid
+import time
 import logging
 
-from client.client import A2AClient               # Handles JSON-RPC communication
+from typing import AsyncIterator, Iterable, Sequence
+
+from client.fanout import FanOutResult, fan_out   # Bounded concurrent fan-out
+from client.hedging import HedgePolicy            # Tail-latency hedging for reads
+from client.http_pool import A2AConnectionPool    # Shared keep-alive transport
+from models.agent import AgentCard                # Registry entry (url / replica urls)
 from models.task import Task                      # Task model for result typing
+from utilities.a2a.load_balancer import ReplicaBalancer  # Replica selection + stats
+from utilities.metrics import REGISTRY            # Process-wide metrics
 
 logger = logging.getLogger(__name__)
 
+DOWNSTREAM_LATENCY = REGISTRY.histogram(
+    "a2a_downstream_latency_seconds", "Latency of tasks sent to downstream agents", ["target"]
+)
+DOWNSTREAM_ERRORS = REGISTRY.counter(
+    "a2a_downstream_errors_total", "Failed task sends to downstream agents", ["target"]
+)
+
 
 class AgentConnector:
     """
@@ -21,15 +38,39 @@ class AgentConnector:
 
     Attributes:
         name (str): Descriptive name of the healthcare agent.
-        client (A2AClient): Client initialized with agent's base URL.
+        balancer (ReplicaBalancer): Picks one of the agent's replicas per request.
+        client (A2AClient): Client for the first replica (single-URL agents).
+
+    All connectors share the process-wide connection pool unless `pool` is given.
+    Pass `urls` (instead of or alongside `base_url`) to spread load over replicas
+    with `strategy` "p2c" (default) or "least_outstanding". With `hedge`,
+    get_task/get_agent_card duplicate slow calls to a second replica.
     """
 
-    def __init__(self, name: str, base_url: str):
+    def __init__(self, name: str, base_url: str = None, pool: A2AConnectionPool = None,
+                 urls: Sequence[str] = None, strategy: str = "p2c", health=None,
+                 hedge: HedgePolicy = None):
         self.name = name
-        self.client = A2AClient(url=base_url)
-        logger.info(f"[AgentConnector] Initialized: {self.name} -> {base_url}")
+        replica_urls = [str(url) for url in (urls or [])] or [str(base_url)]
+        self.balancer = ReplicaBalancer(
+            name, replica_urls, strategy=strategy, pool=pool, hedge=hedge,
+            is_available=health.url_healthy if health is not None else None
+        )
+        self.client = self.balancer.replicas[0].client
+        logger.info(f"[AgentConnector] Initialized: {self.name} -> {', '.join(replica_urls)}")
+
+    @classmethod
+    def from_card(cls, card: AgentCard, pool: A2AConnectionPool = None, strategy: str = "p2c",
+                  health=None, hedge: HedgePolicy = None) -> "AgentConnector":
+        """Build a connector for every endpoint listed on a registry card."""
+        return cls(name=card.name, base_url=card.url, urls=card.urls, pool=pool, strategy=strategy,
+                   health=health, hedge=hedge)
+
+    def stats(self):
+        return self.balancer.stats()
 
-    async def send_task(self, message: str, session_id: str, metadata: dict = None) -> Task:
+    async def send_task(self, message: str, session_id: str, metadata: dict = None,
+                        history_length: int = None) -> Task:
         """
         Sends a user task (e.g., symptoms or appointment intent) to the agent.
 
@@ -37,6 +78,7 @@ class AgentConnector:
             message (str): Message content from the user.
             session_id (str): Unique session ID to group related interactions.
             metadata (dict, optional): Extra context (e.g., patient ID, specialization).
+            history_length (int, optional): Only return the last N history messages.
 
         Returns:
             Task: The full result Task returned from the agent.
@@ -50,13 +92,60 @@ class AgentConnector:
                 "role": "user",
                 "parts": [{"type": "text", "text": message}]
             },
+            "historyLength": history_length,
             "metadata": metadata or {}
         }
 
+        start = time.perf_counter()
         try:
-            result = await self.client.send_task(payload)
-            logger.info(f"[AgentConnector] Task completed from {self.name} (ID: {task_id})")
+            replica = self.balancer.pick()
+            async with self.balancer.track(replica):
+                result = await replica.client.send_task(payload)
+            logger.info(f"[AgentConnector] Task completed from {self.name} via {replica.url} (ID: {task_id})")
             return result
         except Exception as e:
+            DOWNSTREAM_ERRORS.inc(target=self.name)
             logger.error(f"[AgentConnector] Error from {self.name}: {e}")
             raise
+        finally:
+            DOWNSTREAM_LATENCY.observe(time.perf_counter() - start, target=self.name)
+
+    async def get_task(self, task_id: str, history_length: int = None) -> Task:
+        """
+        Fetch a task's current status/history from the agent (hedged if enabled).
+
+        Args:
+            task_id (str): ID of a task previously sent to this agent.
+            history_length (int, optional): Only return the last N history messages.
+        """
+        replica = self.balancer.pick()
+        async with self.balancer.track(replica):
+            return await replica.client.get_task({"id": task_id, "historyLength": history_length})
+
+    async def get_agent_card(self) -> AgentCard:
+        """Fetch the card the agent currently advertises (hedged if enabled)."""
+        replica = self.balancer.pick()
+        async with self.balancer.track(replica):
+            return await replica.client.get_agent_card()
+
+    @staticmethod
+    async def gather(jobs: Iterable[tuple], concurrency: int = 8,
+                     timeout: float = None) -> AsyncIterator[FanOutResult]:
+        """
+        Send many tasks, to one or more agents, with bounded concurrency.
+
+        Args:
+            jobs (iterable): `(connector, message, session_id)` or
+                `(connector, message, session_id, metadata)` tuples; consumed lazily.
+            concurrency (int): Maximum tasks in flight across all agents.
+            timeout (float, optional): Per-task timeout in seconds.
+
+        Yields:
+            FanOutResult: One per job as it completes; `.result` is the Task, or `.error` is set.
+        """
+        async def _send(job) -> Task:
+            connector, *args = job
+            return await connector.send_task(*args)
+
+        async for outcome in fan_out(jobs, _send, concurrency=concurrency, timeout=timeout):
+            yield outcome
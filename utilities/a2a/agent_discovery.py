@@ -1,32 +1,224 @@
+# =============================================================================
+# utilities/a2a/agent_discovery.py
+# =============================================================================
+# Purpose:
+# In-memory registry of downstream agents, loaded from agent_registry.json.
+# Entries may list several replica endpoints under "urls".
+# - The file is parsed once and only re-read when its mtime/size changes
+# - Name, id and skill indexes make lookups O(1) instead of a scan per call
+# - Inside an event loop the stat and re-read run off the loop; sync lookups
+#   only read the cached indexes there (await refresh() for fresh data)
+# - Optionally hides agents that fail background health probes
+#   (see utilities/a2a/agent_health.py)
+# =============================================================================
+
+import asyncio
 import json
 import logging
+import re
+import time
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
 from models.agent import AgentCard
+from utilities.a2a.agent_health import AgentHealthMonitor
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_REGISTRY = Path(__file__).parent / "agent_registry.json"
+
+
+def _normalize(key: str) -> str:
+    """'SymptomCheckerAgent', 'symptom_checker_agent' and 'Symptom Checker Agent' share one key."""
+    return re.sub(r"[^a-z0-9]", "", str(key).lower())
+
+
 class AgentDiscovery:
-    def __init__(self, registry_path="agent_registry.json"):
-        self.registry_path = Path(registry_path)
-        self.agents = []
+    """
+    Cached, indexed view of the agent registry file.
+
+    Args:
+        registry_path (str, optional): Registry JSON; either a list of cards or
+            {"agents": [...]}. Defaults to the registry shipped next to this module.
+        check_interval (float): Minimum seconds between mtime checks.
+        health_interval (float, optional): Probe agents this often and hide the
+            ones that are down. Probing starts on first use inside an event loop.
+    """
+
+    def __init__(self, registry_path=None, check_interval: float = 1.0,
+                 health_interval: float | None = None):
+        self.registry_path = Path(registry_path) if registry_path else DEFAULT_REGISTRY
+        self.check_interval = check_interval
+        self.health = AgentHealthMonitor(self, interval=health_interval) if health_interval else None
+        self.agents: List[AgentCard] = []
+        self.version = 0  # Bumped on every reload so callers can cache derived data
 
-    async def discover_agents(self):
+        self._signature: Optional[Tuple[int, int]] = None
+        self._last_check = float("-inf")
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._by_name: Dict[str, AgentCard] = {}
+        self._by_id: Dict[str, AgentCard] = {}
+        self._by_skill: Dict[str, List[AgentCard]] = {}
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+    def _check_due(self) -> bool:
+        return time.monotonic() - self._last_check >= self.check_interval
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
         try:
-            logger.info("[Discovery] Looking for agents...")
-            if not self.registry_path.exists():
-                logger.warning("[Discovery] Registry file not found.")
-                return []
+            stat = self.registry_path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
 
-            with open(self.registry_path, "r") as f:
-                data = json.load(f)
+    def _read_registry(self) -> List[AgentCard]:
+        with open(self.registry_path, "r") as f:
+            data = json.load(f)
+        entries = data.get("agents", []) if isinstance(data, dict) else data
 
-            self.agents = [AgentCard(**agent) for agent in data.get("agents", [])]
-            logger.info(f"[Discovery] Found {len(self.agents)} agents")
-            return self.agents
+        cards = []
+        for entry in entries:
+            try:
+                if not entry.get("name"):
+                    entry = {**entry, "name": entry.get("id")}
+                if not entry.get("url") and entry.get("urls"):
+                    entry = {**entry, "url": entry["urls"][0]}
+                cards.append(AgentCard(**entry))
+            except Exception as e:
+                logger.warning(f"[Discovery] Skipping invalid registry entry {entry!r}: {e}")
+        return cards
+
+    def _install(self, cards: List[AgentCard], signature):
+        by_name, by_id, by_skill = {}, {}, {}
+        for card in cards:
+            by_name.setdefault(_normalize(card.name), card)
+            if card.id:
+                by_id.setdefault(_normalize(card.id), card)
+            for capability in card.capabilities.capabilities if card.capabilities else []:
+                for skill in capability.skills:
+                    by_skill.setdefault(_normalize(skill.name), []).append(card)
 
+        self.agents, self._by_name, self._by_id, self._by_skill = cards, by_name, by_id, by_skill
+        self._signature = signature
+        self.version += 1
+        logger.info(f"[Discovery] Loaded {len(cards)} agents from {self.registry_path}")
+
+    def _load(self, signature, reader):
+        if signature is None:
+            logger.warning("[Discovery] Registry file not found.")
+            self._install([], None)
+            return
+        try:
+            self._install(reader(), signature)
         except Exception as e:
+            # Keep serving the last good registry
             logger.error(f"[Discovery] Failed to parse registry: {e}")
-            return []
 
-    def get_agents(self):
+    def refresh_sync(self):
+        """Reload the registry if the file changed. Blocking; for code outside an event loop."""
+        if not self._check_due():
+            return
+        self._last_check = time.monotonic()
+        signature = self._stat()
+        if signature != self._signature:
+            self._load(signature, self._read_registry)
+
+    async def refresh(self):
+        """Reload the registry if the file changed; the stat and read run off the event loop."""
+        if self._refresh_task is None or self._refresh_task.done():
+            if not self._check_due():
+                return
+            self._refresh_task = asyncio.ensure_future(self._reload())
+        await asyncio.shield(self._refresh_task)  # Concurrent callers share one check
+
+    async def _reload(self):
+        self._last_check = time.monotonic()
+        signature = await asyncio.to_thread(self._stat)
+        if signature == self._signature:
+            return
+        cards = None
+        if signature is not None:
+            try:
+                cards = await asyncio.to_thread(self._read_registry)
+            except Exception as e:
+                logger.error(f"[Discovery] Failed to parse registry: {e}")
+                return
+        self._load(signature, lambda: cards)
+
+    def _refresh_cached(self):
+        """
+        Keep sync lookups free of disk I/O on the event loop: inside a loop a due
+        check runs as a background task and the lookup uses the current indexes.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.refresh_sync()
+            return
+        if self._check_due() and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = loop.create_task(self._reload())
+
+    def _ensure_health_started(self):
+        if self.health is None or self.health.running:
+            return
+        try:
+            self.health.start()
+        except RuntimeError:
+            pass  # No running loop yet; probing starts on the next async lookup
+
+    def _view(self, card: Optional[AgentCard], healthy_only: bool) -> Optional[AgentCard]:
+        """Apply health filtering and the agent's last advertised card."""
+        if card is None or self.health is None:
+            return card
+        if healthy_only and not self.health.is_healthy(card):
+            # Runs on every lookup; AgentHealthMonitor logs the DOWN/UP transitions
+            logger.debug(f"[Discovery] {card.name} is down; skipping")
+            return None
+        return self.health.card_for(card)
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+    async def discover_agents(self, healthy_only: bool = True) -> List[AgentCard]:
+        await self.refresh()
+        self._ensure_health_started()
+        if self.health is None:
+            return self.agents
+        views = (self._view(card, healthy_only) for card in self.agents)
+        return [card for card in views if card is not None]
+
+    list_agent_cards = discover_agents
+
+    def get_agents(self) -> List[AgentCard]:
         return self.agents
+
+    def find_by_name(self, name: str, healthy_only: bool = True) -> Optional[AgentCard]:
+        """
+        Look up an agent by name or id, ignoring case and separators. Falls
+        back to a substring match (e.g. 'Dermatologist' -> 'DermatologistAgent').
+        Returns None for agents marked down unless `healthy_only` is False.
+        """
+        self._refresh_cached()
+        self._ensure_health_started()
+        key = _normalize(name)
+        card = self._by_name.get(key) or self._by_id.get(key)
+        if card is None and key:
+            card = next((c for k, c in self._by_name.items() if key in k), None)
+        return self._view(card, healthy_only)
+
+    def find_by_id(self, agent_id: str, healthy_only: bool = True) -> Optional[AgentCard]:
+        self._refresh_cached()
+        self._ensure_health_started()
+        return self._view(self._by_id.get(_normalize(agent_id)), healthy_only)
+
+    def find_by_skill(self, skill: str, healthy_only: bool = True) -> List[AgentCard]:
+        self._refresh_cached()
+        self._ensure_health_started()
+        views = (self._view(card, healthy_only) for card in self._by_skill.get(_normalize(skill), []))
+        return [card for card in views if card is not None]
+
+
+# Name used by the appointment agent
+DiscoveryClient = AgentDiscovery
@@ -0,0 +1,187 @@
+# =============================================================================
+# utilities/a2a/agent_health.py
+# =============================================================================
+# Purpose:
+# Background liveness probing for agents listed in the registry.
+# - Periodically fetches each agent's /.well-known/agent.json
+# - Tracks up/down state, consecutive failures and a rolling latency per
+#   replica URL; an agent is up while any replica is
+# - Keeps the most recently advertised AgentCard for each agent
+# - Lets AgentDiscovery hide agents that are down, so callers fail fast
+#   instead of waiting for a request timeout
+# =============================================================================
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from client.client import A2AClient
+from client.http_pool import A2AConnectionPool
+from client.resilience import NO_BREAKER, NO_RETRY
+from models.agent import AgentCard
+from utilities.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+AGENT_UP = REGISTRY.gauge(
+    "a2a_downstream_up", "1 if the downstream replica answered its last probes", ["target", "replica"]
+)
+PROBE_LATENCY = REGISTRY.gauge(
+    "a2a_downstream_probe_latency_seconds", "Rolling agent card fetch latency", ["target", "replica"]
+)
+
+
+class AgentHealth:
+    """
+    Liveness record for one agent (replica) URL. `healthy` is None until the
+    first probe, and unknown replicas are treated as healthy.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.healthy: Optional[bool] = None
+        self.consecutive_failures = 0
+        self.latency: Optional[float] = None
+        self.last_checked: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.card: Optional[AgentCard] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_seconds": self.latency,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error,
+        }
+
+
+class AgentHealthMonitor:
+    """
+    Probes every agent known to `discovery` on a fixed interval.
+
+    Args:
+        discovery (AgentDiscovery): Registry whose agents are probed.
+        interval (float): Seconds between probe rounds.
+        timeout (float): Per-probe timeout; much shorter than a task timeout.
+        failure_threshold (int): Consecutive failures before an agent is marked down.
+        latency_alpha (float): Weight of the newest sample in the rolling latency.
+        pool (A2AConnectionPool, optional): Connection pool; defaults to the shared pool.
+    """
+
+    def __init__(self, discovery, interval: float = 15.0, timeout: float = 2.0,
+                 failure_threshold: int = 2, latency_alpha: float = 0.3,
+                 pool: A2AConnectionPool = None):
+        self.discovery = discovery
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.latency_alpha = latency_alpha
+        self.pool = pool
+        self.agents: Dict[str, AgentHealth] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _urls(card: AgentCard) -> List[str]:
+        if card.urls:
+            return [str(url) for url in card.urls]
+        return [str(card.url)] if card.url else []
+
+    def url_healthy(self, url: str) -> bool:
+        health = self.agents.get(str(url))
+        return health is None or health.healthy is not False
+
+    def is_healthy(self, card: AgentCard) -> bool:
+        """An agent is up while any of its replicas is (or has not been probed yet)."""
+        urls = self._urls(card)
+        return not urls or any(self.url_healthy(url) for url in urls)
+
+    def card_for(self, card: AgentCard) -> AgentCard:
+        """Registry card enriched with what the agent last advertised (keeping the registry URLs)."""
+        advertised = next(
+            (h.card for h in map(self.agents.get, self._urls(card)) if h is not None and h.card is not None), None
+        )
+        if advertised is None:
+            return card
+        return advertised.model_copy(update={"id": card.id or advertised.id, "url": card.url, "urls": card.urls})
+
+    # -------------------------------------------------------------------------
+    # Probing
+    # -------------------------------------------------------------------------
+    async def _probe_url(self, name: str, url: str) -> AgentHealth:
+        health = self.agents.setdefault(url, AgentHealth(url))
+        start = time.perf_counter()
+        try:
+            # The next round is the retry; probes bypass the shared breaker so their
+            # failures don't open it for live traffic, and an open breaker doesn't
+            # hide a recovered agent from the probe
+            client = A2AClient(url=url, pool=self.pool, retry=NO_RETRY, breaker=NO_BREAKER)
+            health.card = await asyncio.wait_for(client.get_agent_card(timeout=self.timeout), self.timeout)
+        except Exception as e:
+            health.consecutive_failures += 1
+            health.last_error = str(e) or type(e).__name__
+            if health.consecutive_failures >= self.failure_threshold and health.healthy is not False:
+                logger.warning(f"[Health] {name} ({url}) marked DOWN ({health.last_error})")
+                health.healthy = False
+        else:
+            elapsed = time.perf_counter() - start
+            health.latency = elapsed if health.latency is None else (
+                self.latency_alpha * elapsed + (1 - self.latency_alpha) * health.latency
+            )
+            if health.healthy is False:
+                logger.info(f"[Health] {name} ({url}) is back UP")
+            health.healthy = True
+            health.consecutive_failures = 0
+            health.last_error = None
+            PROBE_LATENCY.set(health.latency, target=name, replica=url)
+        finally:
+            health.last_checked = time.time()
+            AGENT_UP.set(0 if health.healthy is False else 1, target=name, replica=url)
+        return health
+
+    async def probe(self, card: AgentCard) -> List[AgentHealth]:
+        """Probe every replica of `card`."""
+        return list(await asyncio.gather(*(self._probe_url(card.name, url) for url in self._urls(card))))
+
+    async def probe_all(self):
+        cards = await self.discovery.discover_agents(healthy_only=False)
+        await asyncio.gather(*(self.probe(card) for card in cards))
+
+        # Forget agents that were removed from the registry
+        live = {url for card in cards for url in self._urls(card)}
+        for key in set(self.agents) - live:
+            del self.agents[key]
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"[Health] Probe round failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    def start(self):
+        """Start probing in the background (requires a running event loop); idempotent."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {key: health.to_dict() for key, health in self.agents.items()}
@@ -0,0 +1,121 @@
+# =============================================================================
+# utilities/a2a/connector_pool.py
+# =============================================================================
+# Purpose:
+# Process-wide pool of AgentConnectors, so routing a message does not build
+# a new connector (and client, balancer and replica state) every time.
+# - Keyed by agent id and endpoint URLs; a URL change yields a new entry
+# - Entries whose agent left the registry are dropped on the next lookup
+#   after AgentDiscovery reloads
+# - Tracks per-connector usage for debugging and metrics
+# =============================================================================
+
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from models.agent import AgentCard
+from utilities.a2a.agent_connect import AgentConnector
+from utilities.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+POOL_LOOKUPS = REGISTRY.counter("a2a_connector_pool_lookups_total", "Connector pool lookups", ["result"])
+
+
+class _PooledConnector:
+    __slots__ = ("connector", "uses", "created_at", "last_used")
+
+    def __init__(self, connector: AgentConnector):
+        self.connector = connector
+        self.uses = 0
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+
+class ConnectorPool:
+    """
+    Reuses one AgentConnector per agent.
+
+    Args:
+        **connector_options: Passed to AgentConnector.from_card (pool, strategy, hedge).
+    """
+
+    def __init__(self, **connector_options):
+        self.connector_options = connector_options
+        self._entries: Dict[Tuple[str, Tuple[str, ...]], _PooledConnector] = {}
+        self._registry_version: Optional[Tuple[int, int]] = None
+
+    @staticmethod
+    def _key(card: AgentCard) -> Tuple[str, Tuple[str, ...]]:
+        urls = card.urls or ([card.url] if card.url else [])
+        return card.id or card.name, tuple(str(url) for url in urls)
+
+    def _sync(self, discovery):
+        """Drop connectors for agents that are no longer in the registry after a reload."""
+        version = (id(discovery), discovery.version)
+        if version == self._registry_version:
+            return
+        self._registry_version = version
+        live = {self._key(card) for card in discovery.agents}
+        for key in set(self._entries) - live:
+            logger.info(f"[ConnectorPool] Dropping connector for {key[0]} (registry changed)")
+            del self._entries[key]
+
+    def get(self, card: AgentCard, discovery=None) -> AgentConnector:
+        """
+        Connector for `card`, created on first use.
+
+        Args:
+            card (AgentCard): Registry card (from AgentDiscovery).
+            discovery (AgentDiscovery, optional): Registry the card came from; used to
+                prune stale connectors and to share its health monitor.
+        """
+        if discovery is not None:
+            self._sync(discovery)
+
+        key = self._key(card)
+        entry = self._entries.get(key)
+        if entry is None:
+            POOL_LOOKUPS.inc(result="miss")
+            health = discovery.health if discovery is not None else None
+            connector = AgentConnector.from_card(card, health=health, **self.connector_options)
+            entry = self._entries[key] = _PooledConnector(connector)
+        else:
+            POOL_LOOKUPS.inc(result="hit")
+
+        entry.uses += 1
+        entry.last_used = time.time()
+        return entry.connector
+
+    def invalidate(self, card: AgentCard = None):
+        """Forget the connector for `card`, or every connector when omitted."""
+        if card is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(card), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            entry.connector.name: {
+                "uses": entry.uses,
+                "created_at": entry.created_at,
+                "last_used": entry.last_used,
+                "replicas": entry.connector.stats(),
+            }
+            for entry in self._entries.values()
+        }
+
+
+_shared_pool: Optional[ConnectorPool] = None
+
+
+def get_connector_pool() -> ConnectorPool:
+    """Process-wide ConnectorPool, created on first use."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = ConnectorPool()
+    return _shared_pool
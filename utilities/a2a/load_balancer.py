@@ -0,0 +1,133 @@
+# =============================================================================
+# utilities/a2a/load_balancer.py
+# =============================================================================
+# Purpose:
+# Client-side load balancing across replicas of one agent.
+# - "p2c": power-of-two-choices; sample two replicas, take the one with the
+#   lower (outstanding + 1) x rolling latency score
+# - "least_outstanding": take the replica with the fewest in-flight requests
+# - Replicas reported down by the health monitor, or whose circuit breaker
+#   is open, are skipped while any replica is still available
+# =============================================================================
+
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from client.client import A2AClient
+from client.hedging import HedgePolicy
+from client.http_pool import A2AConnectionPool
+from client.resilience import OPEN
+from utilities.metrics import REGISTRY
+
+REPLICA_REQUESTS = REGISTRY.counter("a2a_replica_requests_total", "Requests sent per agent replica", ["target", "replica"])
+REPLICA_OUTSTANDING = REGISTRY.gauge("a2a_replica_outstanding", "In-flight requests per agent replica", ["target", "replica"])
+
+STRATEGIES = ("p2c", "least_outstanding")
+
+
+class Replica:
+    """One endpoint of an agent plus the feedback used to score it."""
+
+    def __init__(self, url: str, pool: A2AConnectionPool = None, hedge: HedgePolicy = None,
+                 siblings: Sequence[str] = ()):
+        self.url = url
+        self.client = A2AClient(url=url, pool=pool, hedge=hedge, replicas=siblings)
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.latency: Optional[float] = None
+
+    def score(self, default_latency: float) -> float:
+        return (self.outstanding + 1) * (self.latency if self.latency is not None else default_latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_seconds": self.latency,
+        }
+
+
+class ReplicaBalancer:
+    """
+    Picks a replica per request and learns from the outcome.
+
+    Args:
+        name (str): Agent name (metric label).
+        urls (list[str]): Replica endpoints.
+        strategy (str): "p2c" or "least_outstanding".
+        latency_alpha (float): Weight of the newest sample in the rolling latency.
+        is_available (callable, optional): `url -> bool`; replicas returning False are skipped.
+        pool (A2AConnectionPool, optional): Connection pool; defaults to the shared pool.
+        hedge (HedgePolicy, optional): Hedge idempotent calls to another replica.
+    """
+
+    def __init__(self, name: str, urls: Sequence[str], strategy: str = "p2c", latency_alpha: float = 0.3,
+                 is_available: Callable[[str], bool] = None, pool: A2AConnectionPool = None,
+                 hedge: HedgePolicy = None):
+        if not urls:
+            raise ValueError("At least one replica URL is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}; expected one of {STRATEGIES}")
+        self.name = name
+        self.strategy = strategy
+        self.latency_alpha = latency_alpha
+        self.is_available = is_available
+        unique_urls = list(dict.fromkeys(map(str, urls)))
+        self.replicas: List[Replica] = [
+            Replica(url, pool=pool, hedge=hedge, siblings=unique_urls) for url in unique_urls
+        ]
+
+    def _available(self, replica: Replica) -> bool:
+        if replica.client.breaker is not None and replica.client.breaker.state == OPEN:
+            return False
+        return self.is_available is None or self.is_available(replica.url)
+
+    def _candidates(self) -> List[Replica]:
+        # Fall back to every replica if none look available; a probe may be stale,
+        # and an open breaker will fail fast anyway
+        return [r for r in self.replicas if self._available(r)] or self.replicas
+
+    def pick(self) -> Replica:
+        candidates = self._candidates()
+        if len(candidates) == 1:
+            return candidates[0]
+
+        if self.strategy == "least_outstanding":
+            lowest = min(r.outstanding for r in candidates)
+            return random.choice([r for r in candidates if r.outstanding == lowest])
+
+        # Unmeasured replicas score as the mean so they still get traffic
+        measured = [r.latency for r in candidates if r.latency is not None]
+        default_latency = sum(measured) / len(measured) if measured else 1.0
+        first, second = random.sample(candidates, 2)
+        return first if first.score(default_latency) <= second.score(default_latency) else second
+
+    @asynccontextmanager
+    async def track(self, replica: Replica) -> AsyncIterator[Replica]:
+        """Count the request as outstanding on `replica` and record its latency/outcome."""
+        replica.outstanding += 1
+        replica.requests += 1
+        REPLICA_REQUESTS.inc(target=self.name, replica=replica.url)
+        REPLICA_OUTSTANDING.set(replica.outstanding, target=self.name, replica=replica.url)
+        start = time.perf_counter()
+        try:
+            yield replica
+        except Exception:
+            replica.errors += 1
+            raise
+        else:
+            elapsed = time.perf_counter() - start
+            replica.latency = elapsed if replica.latency is None else (
+                self.latency_alpha * elapsed + (1 - self.latency_alpha) * replica.latency
+            )
+        finally:
+            replica.outstanding -= 1
+            REPLICA_OUTSTANDING.set(replica.outstanding, target=self.name, replica=replica.url)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [replica.to_dict() for replica in self.replicas]